@@ -1,6 +1,8 @@
 import logging
 import bcrypt
 
+from app.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 def _truncate_password(password: str) -> str:
@@ -47,6 +49,6 @@ def get_password_hash(password: str) -> str:
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
     
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
\ No newline at end of file
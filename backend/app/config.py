@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # bcrypt work factor; tests lower it to keep signup fast
+    bcrypt_rounds: int = 12
     
     # Database configuration for storing conversations and user data
     mongodb_url: str = "mongodb://localhost:27017"
@@ -117,6 +119,14 @@ class Settings(BaseSettings):
             raise ValueError("MONGODB_URL must be set")
         return v
     
+    @field_validator("bcrypt_rounds")
+    @classmethod
+    # bcrypt only accepts a work factor between 4 and 31
+    def validate_bcrypt_rounds(cls, v):
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    
     model_config = {
         "env_file": ".env",
         "case_sensitive": False
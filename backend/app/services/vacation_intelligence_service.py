@@ -1,11 +1,358 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, FrozenSet, Tuple
 import logging
 import re
 import json
+from functools import lru_cache
 from app.domains.vacation.config_loader import vacation_config_loader
 
 logger = logging.getLogger(__name__)
 
+# Words that are never destinations, even when the AI or the regex thinks so
+_COMMON_VERBS = frozenset({
+    "visit", "go", "travel", "trip", "vacation", "holiday", "journey",
+    "explore", "see", "tour", "tourist", "tourists", "traveling", "travelling",
+    "plan", "planning", "want", "wants", "would", "like", "love", "dream",
+    "thinking", "considering", "interested", "looking", "hoping", "wishing"
+})
+
+# Single words that show the latest message is about preferences/interests,
+# matched against the message's tokens
+_PREFERENCE_WORDS = frozenset({
+    'want', 'prefer', 'options', 'ideas', 'experience', 'adventure', 'culture', 'food', 'local',
+    'affordable', 'cheap', 'save', 'explore', 'try', 'see', 'do', 'enjoy', 'fun', 'relax',
+    'discover', 'learn', 'meet', 'connect', 'enrich', 'grow', 'enjoyable', 'memorable', 'unique',
+    'special', 'different', 'variety', 'diverse', 'broad', 'wide', 'range', 'choice', 'select',
+    'pick', 'choose', 'decide', 'consider', 'think', 'plan', 'dream', 'wish', 'hope', 'aspire',
+    'goal', 'aim', 'objective', 'target', 'purpose', 'reason', 'motivation', 'drive', 'passion',
+    'interest', 'curious', 'curiosity'
+})
+
+# Multi-word preference phrases still need a substring check
+_PREFERENCE_PHRASES = (
+    'looking for', 'interested in', 'not luxury', 'not expensive', 'not costly', 'not pricey',
+    'budget-friendly'
+)
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+# Budget level and concern labels, spelled in one place
+_ULTRA_BUDGET = "ultra_budget"
+_BUDGET = "budget"
+_MODERATE = "moderate"
+_LUXURY = "luxury"
+
+_SAFETY = "safety"
+_HEALTH = "health"
+_WEATHER = "weather"
+_LANGUAGE = "language"
+
+# Budget levels as (label, keywords, phrases), checked in this order
+_BUDGET_PATTERNS = (
+    (_ULTRA_BUDGET,
+     ("backpack", "hostel", "cheapest", "shoestring", "broke"),
+     ("as cheap as possible", "very tight budget", "no money")),
+    (_BUDGET,
+     ("budget", "cheap", "affordable", "economical", "save"),
+     ("on a budget", "save money", "cost conscious", "good value")),
+    (_MODERATE,
+     ("moderate", "comfortable", "reasonable", "balanced"),
+     ("mid-range", "not too expensive", "decent hotels", "some nice meals")),
+    (_LUXURY,
+     ("luxury", "premium", "exclusive", "splurge", "best"),
+     ("five star", "no budget", "money no object", "treat ourselves")),
+)
+
+# Concerns as (label, keywords)
+_CONCERN_PATTERNS = (
+    (_SAFETY, ("safe", "unsafe", "dangerous", "crime", "secure", "risk", "safety")),
+    (_HEALTH, ("health", "medical", "hospital", "vaccine", "illness", "doctor")),
+    (_WEATHER, ("weather", "rain", "hot", "cold", "hurricane", "climate", "season")),
+    ("crowds", ("crowd", "busy", "tourist", "peaceful", "quiet", "packed", "overcrowded")),
+    (_LANGUAGE, ("language", "english", "speak", "communicate", "understand")),
+    ("cost", ("expensive", "cost", "price", "afford", "budget", "money")),
+    ("solo_travel", ("alone", "solo", "single", "by myself", "solo travel")),
+    ("accessibility", ("wheelchair", "accessible", "disability", "mobility")),
+    ("dietary", ("vegetarian", "vegan", "allergy", "dietary", "food restrictions")),
+    ("visa", ("visa", "passport", "documentation", "entry requirements")),
+)
+
+# Experience levels as (label, indicator phrases); the first match wins
+_EXPERIENCE_PATTERNS = (
+    ("beginner", (
+        "first time", "never been", "new to travel", "nervous about",
+        "worried about", "inexperienced", "first international"
+    )),
+    ("intermediate", (
+        "traveled before", "been to a few", "some experience",
+        "comfortable with", "done this before"
+    )),
+    ("experienced", (
+        "traveled extensively", "been everywhere", "seasoned traveler",
+        "always traveling", "travel frequently", "been to many"
+    )),
+)
+
+# Explicit budget amounts like "$3,000", "eur 500" or "2000 dollars"
+_CURRENCY_PATTERNS = (
+    re.compile(r'(?P<symbol>[$€£])\s*(?P<amount>[\d,]+)', re.IGNORECASE),
+    re.compile(r'(?P<currency>usd|eur|gbp|cad|aud|sgd|inr)\s*(?P<amount>[\d,]+)', re.IGNORECASE),
+    re.compile(r'(?P<amount>[\d,]+)\s*(?P<currency>usd|eur|gbp|cad|aud|sgd|inr|dollars|euros|pounds|bucks)', re.IGNORECASE),
+)
+
+_CURRENCY_SYMBOLS = {
+    "$": "$",
+    "€": "€",
+    "£": "£",
+    "usd": "$",
+    "dollars": "$",
+    "bucks": "$",
+    "eur": "€",
+    "euros": "€",
+    "gbp": "£",
+    "pounds": "£",
+    "cad": "$",
+    "aud": "$",
+    "sgd": "$",
+    "inr": "₹"
+}
+
+# Recommendation content for get_smart_recommendations
+_WELCOME_MSG = (
+    "👋 **Welcome to Vacation Planning!**\n\n"
+    "I'm here to help you plan your perfect trip. "
+    "Let's start by understanding what you're dreaming of for your vacation."
+)
+
+_TARGETED_INSPIRATION_TMPL = (
+    "🎯 **Perfect for {interest_title} Lovers**\n\n"
+    "Since you're into {interest}, think about:\n"
+    "• **Tropical Paradise** - Beach resorts with {interest} activities\n"
+    "• **Mountain Escapes** - High-altitude {interest} experiences\n"
+    "• **Cultural Hubs** - Cities known for {interest}\n\n"
+    "What kind of setting sounds most appealing to you?"
+)
+
+_COMPARISON_FRAMEWORK_MSG = (
+    "📊 **Smart Comparison Framework**\n\n"
+    "To help you decide, think about:\n"
+    "• **Total Cost** (flights + accommodation + activities)\n"
+    "• **Weather** during your travel period\n"
+    "• **Activities** that match your interests\n"
+    "• **Travel Time** and convenience\n"
+    "• **Visa Requirements** and ease of entry\n\n"
+    "Which factor matters most to you?"
+)
+
+_PLANNING_STRUCTURE_MSG = (
+    "📅 **Smart Planning Approach**\n\n"
+    "Let's structure your trip:\n"
+    "1. **Arrival & Settling** (Day 1)\n"
+    "2. **Major Attractions** (Days 2-3)\n"
+    "3. **Local Experiences** (Days 4-5)\n"
+    "4. **Hidden Gems** (Day 6)\n"
+    "5. **Departure Prep** (Last Day)\n\n"
+    "How many days are you thinking of staying?"
+)
+
+_DESTINATION_FOCUS_TMPL = (
+    "🗺️ **{dest} Highlights**\n\n"
+    "I can help you discover the best of {dest}:\n"
+    "• **Must-See Attractions**\n"
+    "• **Local Cuisine & Dining**\n"
+    "• **Hidden Gems**\n"
+    "• **Best Neighborhoods**\n"
+    "• **Practical Tips**\n\n"
+    "What interests you most about {dest}?"
+)
+
+_CONCERN_RESPONSES = {
+    _SAFETY: "🔒 **Safety First**: I'll focus on safe neighborhoods, reliable transportation, and current travel advisories.",
+    _BUDGET: "💰 **Budget-Conscious Planning**: Let's find great value options and money-saving tips.",
+    _WEATHER: "🌤️ **Weather Considerations**: I'll help you pick the best time and prepare for conditions.",
+    _LANGUAGE: "🗣️ **Communication Tips**: I'll share key phrases and apps to help you communicate.",
+    _HEALTH: "🏥 **Health Preparedness**: Let's cover vaccinations, insurance, and medical facilities."
+}
+
+# Quick-reply suggestion for the concerns we have one for
+_CONCERN_SUGGESTIONS = {
+    _SAFETY: "Is it safe to travel there?",
+    _BUDGET: "How can I save money?",
+    _WEATHER: "What's the weather like?"
+}
+
+# When several concerns come up, address them in this order
+_CONCERN_PRIORITY = (_SAFETY, _BUDGET, _HEALTH, _WEATHER, _LANGUAGE)
+
+_READINESS_PROMPT_TMPL = "✅ **Almost Ready!** Just need your {missing} to create a complete plan."
+
+_EXPLORATION_GUIDANCE_MSG = (
+    "🌟 **Let's Find Your Perfect Destination**\n\n"
+    "I can help you discover:\n"
+    "• **Beach Getaways** - Relaxation and water activities\n"
+    "• **City Breaks** - Culture, food, and urban adventures\n"
+    "• **Mountain Escapes** - Hiking and outdoor activities\n"
+    "• **Cultural Journeys** - History, art, and local traditions\n\n"
+    "What kind of experience are you dreaming of?"
+)
+
+_PLANNING_GUIDANCE_MSG = (
+    "📋 **Let's Build Your Perfect Itinerary**\n\n"
+    "I can help you plan:\n"
+    "• **Daily Schedules** - Optimized for your interests\n"
+    "• **Accommodation** - Best areas and options\n"
+    "• **Transportation** - Getting around efficiently\n"
+    "• **Local Tips** - Insider knowledge and advice\n\n"
+    "What would you like to focus on first?"
+)
+
+_GENERAL_GUIDANCE_MSG = (
+    "🎯 **Let's Plan Your Perfect Trip**\n\n"
+    "I'm here to help you create an amazing vacation experience. "
+    "Tell me about your travel dreams and I'll guide you every step of the way!"
+)
+
+
+# Planning signals we look for in a single pass, one bit per kind of signal
+_MONTH_BIT = 1
+_DURATION_BIT = 2
+_BUDGET_BIT = 4
+_COMPARISON_BIT = 8
+_PREFERENCE_BIT = 16
+_TIGHT_BUDGET_BIT = 32
+
+_SIGNAL_GROUPS = (
+    (_MONTH_BIT, ("july", "august", "september", "october", "november", "december",
+                  "january", "february", "march", "april", "may", "june")),
+    (_DURATION_BIT, ("days", "weeks", "months", "duration", "length")),
+    (_BUDGET_BIT, ("budget", "cost", "price", "money", "dollars", "euros")),
+    (_COMPARISON_BIT, ("between", "vs", "versus", "or", "compare", "comparison", "which", "rather", "instead")),
+    (_PREFERENCE_BIT, _PREFERENCE_PHRASES),
+    (_TIGHT_BUDGET_BIT, ("tight budget", "limited budget", "small budget", "low budget", "restricted budget")),
+)
+
+
+def _build_phrase_matcher(tagged_phrases, word_start: bool = False):
+    # Build one regex that finds every phrase at every position (the lookahead
+    # lets matches overlap, just like separate substring checks would) and map
+    # each phrase to the tags it stands for. With word_start, phrases only
+    # match at the start of a word.
+    own_tags: Dict[str, set] = {}
+    for phrase, tag in tagged_phrases:
+        own_tags.setdefault(phrase, set()).add(tag)
+    # Longest phrases win at a given position, so they also carry the tags of
+    # any shorter phrase that starts there (e.g. "budget-friendly" -> "budget")
+    tags: Dict[str, FrozenSet] = {}
+    for phrase in own_tags:
+        combined = set()
+        for other, other_tags in own_tags.items():
+            if phrase.startswith(other):
+                combined |= other_tags
+        tags[phrase] = frozenset(combined)
+    ordered = sorted(own_tags, key=len, reverse=True)
+    boundary = r"\b" if word_start else ""
+    pattern = re.compile("(?=" + boundary + "(" + "|".join(re.escape(p) for p in ordered) + "))")
+    return pattern, tags
+
+
+_SIGNAL_RE, _SIGNAL_PHRASE_TAGS = _build_phrase_matcher(
+    (phrase, bit) for bit, phrases in _SIGNAL_GROUPS for phrase in phrases
+)
+# Every bit is a distinct power of two, so the sum is the same as OR-ing them
+_SIGNAL_TAGS = {phrase: sum(bits) for phrase, bits in _SIGNAL_PHRASE_TAGS.items()}
+
+# Budget, concern and experience keywords, tagged with (category, label) so a
+# single pass over the text serves all three detectors
+_DETECTOR_ENTRIES = (
+    [(k, ("budget", level)) for level, keywords, _ in _BUDGET_PATTERNS for k in keywords]
+    + [(p, ("budget_phrase", level)) for level, _, phrases in _BUDGET_PATTERNS for p in phrases]
+    + [(k, ("concern", label)) for label, keywords in _CONCERN_PATTERNS for k in keywords]
+    + [(p, ("experience", level)) for level, phrases in _EXPERIENCE_PATTERNS for p in phrases]
+)
+
+
+# Every keyword and phrase is matched at the start of a word, with the end
+# left open: "rainy", "costly" and "backpackers" still hit their keywords as
+# the substring checks did, while "train" is no longer rain and "casino
+# money" is no longer "no money".
+_DETECTOR_RE, _DETECTOR_TAGS = _build_phrase_matcher(_DETECTOR_ENTRIES, word_start=True)
+
+
+def _signal_bits(text: str) -> int:
+    # Walk the text once and collect every planning signal it contains.
+    bits = 0
+    for match in _SIGNAL_RE.finditer(text):
+        bits |= _SIGNAL_TAGS[match.group(1)]
+    return bits
+
+
+def _detector_hits(text: str) -> FrozenSet[Tuple[str, str]]:
+    # Collect the (category, label) of every detector keyword in already
+    # lowercased text.
+    hits = set()
+    for match in _DETECTOR_RE.finditer(text):
+        hits |= _DETECTOR_TAGS[match.group(1)]
+    return frozenset(hits)
+
+
+def _standalone_detector_hits(text: str) -> FrozenSet[Tuple[str, str]]:
+    # A detector called on its own gets raw text; analyze_conversation
+    # lowercases once up front and passes its hits in instead.
+    if not isinstance(text, str):
+        return frozenset()
+    return _detector_hits(text.lower())
+
+
+def _parse_budget_amount(text: str) -> Optional[Tuple[int, str]]:
+    # Find the first explicit amount and its currency symbol.
+    for pattern in _CURRENCY_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            digits = re.sub(r"[^\d]", "", match.group("amount"))
+            if not digits:
+                continue
+            raw_currency = match.groupdict().get("symbol") or match.groupdict().get("currency")
+            currency_key = raw_currency.lower() if isinstance(raw_currency, str) else raw_currency
+            return int(digits), _CURRENCY_SYMBOLS.get(currency_key, "$")
+    return None
+
+
+@lru_cache(maxsize=256)
+def _lowered(values: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Lowercase a set of names once and reuse it on the next chat turn.
+    return tuple(value.lower() for value in values)
+
+
+# Insight fields read by the suggestion/recommendation builders, with defaults.
+# Defaults are tuples so a missing field can never be mutated and shared.
+_INSIGHT_KEYS = (
+    "decision_stage", "stage_confidence", "detected_interests",
+    "decision_readiness", "mentioned_destinations", "concerns"
+)
+_INSIGHT_DEFAULTS = ("exploring", 0, (), 0, (), ())
+
+
+def _unpack_insights(insights: Dict) -> Tuple:
+    # Read every field we need in one go:
+    # (stage, confidence, interests, readiness, mentioned_destinations, concerns)
+    return tuple(map(insights.get, _INSIGHT_KEYS, _INSIGHT_DEFAULTS))
+
+
+def _first_unique(items: List[str], limit: int) -> List[str]:
+    # Keep the first `limit` distinct items in order and stop looking after that.
+    seen = set()
+    seen_add = seen.add
+    unique: List[str] = []
+    unique_append = unique.append
+    for item in items:
+        if item in seen:
+            continue
+        seen_add(item)
+        unique_append(item)
+        if len(unique) == limit:
+            break
+    return unique
+
 
 class VacationIntelligenceService:
     # Helps understand what users want for their vacation by reading between the lines.
@@ -15,6 +362,13 @@ class VacationIntelligenceService:
         logger.info("Started up the vacation intelligence service")
         self.stage_keywords = self._init_stage_keywords()
         self.openai_service = openai_service
+        # Suggestion builders for each planning stage
+        self._stage_suggesters = {
+            "exploring": self._suggest_exploring,
+            "comparing": self._suggest_comparing,
+            "planning": self._suggest_planning,
+            "finalizing": self._suggest_finalizing
+        }
         
     def _default_stage_keywords(self) -> Dict[str, Dict[str, List[str]]]:
         return {
@@ -101,10 +455,12 @@ class VacationIntelligenceService:
         
         # Look at all user messages to understand what they want
         user_messages = [m for m in messages if m["role"] == "user"]
-        full_text = " ".join([m["content"].lower() for m in user_messages])
+        # Lowercase every message once; everything below works on these
+        lowered_messages = [m["content"].lower() for m in user_messages]
+        full_text = " ".join(lowered_messages)
         
         # Figure out where they are in planning their trip
-        stage_scores = self._calculate_stage_scores(user_messages, current_preferences)
+        stage_scores = self._calculate_stage_scores(user_messages, current_preferences, lowered_messages)
         insights["decision_stage"] = stage_scores["stage"]
         insights["stage_confidence"] = stage_scores["confidence"]
         insights["stage_progression"] = stage_scores["progression"]
@@ -121,24 +477,11 @@ class VacationIntelligenceService:
         # Try AI extraction first, fallback to known list
         ai_destinations = await self._extract_destinations_with_ai(user_messages) if self.openai_service else None
         
-        # Post-process AI-extracted destinations through alias mapping and filter verbs
-        common_verbs = {
-            "visit", "go", "travel", "trip", "vacation", "holiday", "journey",
-            "explore", "see", "tour", "tourist", "tourists", "traveling", "travelling",
-            "plan", "planning", "want", "wants", "would", "like", "love", "dream",
-            "thinking", "considering", "interested", "looking", "hoping", "wishing"
-        }
-        
+        # Post-process AI-extracted destinations and filter out verbs
         if ai_destinations:
-            processed_destinations = []
-            for dest in ai_destinations:
-                dest_lower = dest.lower().strip()
-                # Skip common verbs
-                if dest_lower in common_verbs:
-                    logger.debug(f"Filtered out verb '{dest}' from AI-extracted destinations")
-                    continue
-                
-                processed_destinations.append(dest)
+            processed_destinations = [
+                dest for dest in ai_destinations if dest.lower().strip() not in _COMMON_VERBS
+            ]
             
             insights["mentioned_destinations"] = processed_destinations if processed_destinations else self._extract_destinations(user_messages)
         else:
@@ -151,21 +494,25 @@ class VacationIntelligenceService:
             insights["mentioned_destinations"]
         )
         
+        # One scan of the text feeds the budget, concern and experience detectors
+        detector_hits = _detector_hits(full_text)
+        
         # Look for budget clues
-        insights["budget_indicators"] = self._detect_budget_level(full_text, budget_amount_info)
+        insights["budget_indicators"] = self._detect_budget_level(full_text, budget_amount_info, detector_hits)
         
         # Find any concerns they might have
-        insights["concerns"] = self._detect_concerns(full_text)
+        insights["concerns"] = self._detect_concerns(full_text, detector_hits)
         
         # See how experienced they are with travel
-        insights["travel_experience_level"] = self._detect_experience_level(full_text)
+        insights["travel_experience_level"] = self._detect_experience_level(full_text, detector_hits)
         
         return insights
     
     def _calculate_stage_scores(
         self, 
         user_messages: List[Dict], 
-        preferences: Optional[Dict]
+        preferences: Optional[Dict],
+        lowered_messages: Optional[List[str]] = None
     ) -> Dict:
         # Figure out where the user is in planning their trip.
         # Debug logging removed for production
@@ -181,30 +528,27 @@ class VacationIntelligenceService:
         recent_weight = 0.7
         older_weight = 0.3
         
-        recent_messages = user_messages[-3:] if len(user_messages) > 3 else user_messages
-        older_messages = user_messages[:-3] if len(user_messages) > 3 else []
+        if lowered_messages is None:
+            lowered_messages = [msg["content"].lower() for msg in user_messages]
+        
+        recent_messages = lowered_messages[-3:] if len(lowered_messages) > 3 else lowered_messages
+        older_messages = lowered_messages[:-3] if len(lowered_messages) > 3 else []
         
         # Look at recent messages
-        for i, msg in enumerate(recent_messages):
-            text = msg["content"].lower()
+        for text in recent_messages:
+            contains = text.__contains__
             for stage, keywords in self.stage_keywords.items():
-                score = 0
-                # Check positive keywords
-                for keyword in keywords["positive"]:
-                    if keyword in text:
-                        score += 1
-                # Check questions
-                for question in keywords["questions"]:
-                    if question in text:
-                        score += 1.5  # Questions are stronger indicators
+                # Positive keywords count 1, questions are stronger indicators
+                score = sum(map(contains, keywords["positive"]))
+                score += 1.5 * sum(map(contains, keywords["questions"]))
                 
                 stage_scores[stage] += score * recent_weight
         
         # Look at older messages
-        for i, msg in enumerate(older_messages):
-            text = msg["content"].lower()
+        for text in older_messages:
+            contains = text.__contains__
             for stage, keywords in self.stage_keywords.items():
-                score = sum(1 for keyword in keywords["positive"] if keyword in text)
+                score = sum(map(contains, keywords["positive"]))
                 stage_scores[stage] += score * older_weight
         
         # Adjust scores based on what we already know about them
@@ -221,21 +565,23 @@ class VacationIntelligenceService:
         # Look for planning clues in the most recent message
         explicit_stage_override = None
         if user_messages:
-            latest_message = user_messages[-1]["content"]
-            latest_message_lower = latest_message.lower()
+            latest_message_lower = lowered_messages[-1]
+            latest_tokens = set(_WORD_RE.findall(latest_message_lower))
+            latest_signals = _signal_bits(latest_message_lower)
+            has_preference = bool(latest_tokens & _PREFERENCE_WORDS) or bool(latest_signals & _PREFERENCE_BIT)
             
             # Check for specific planning indicators
-            has_planning = any(word in latest_message_lower for word in ["july", "august", "september", "october", "november", "december", 
-                                                       "january", "february", "march", "april", "may", "june"])
-            has_duration = any(word in latest_message_lower for word in ["days", "weeks", "months", "duration", "length"])
-            has_budget = any(word in latest_message_lower for word in ["budget", "cost", "price", "money", "dollars", "euros"])
+            has_planning = bool(latest_signals & _MONTH_BIT)
+            has_duration = bool(latest_signals & _DURATION_BIT)
+            has_budget = bool(latest_signals & _BUDGET_BIT)
             
             # Check if ANY message in the conversation mentions multiple destinations for comparison
-            all_messages_text = " ".join([msg["content"].lower() for msg in user_messages])
+            all_messages_text = " ".join(lowered_messages)
+            all_signals = _signal_bits(all_messages_text)
             city_test_set = {"paris", "tokyo", "new york", "london", "rome", "barcelona", "amsterdam", "berlin", "prague", "vienna", "budapest", "copenhagen", "stockholm", "oslo", "helsinki", "reykjavik", "dublin", "edinburgh", "glasgow", "manchester", "birmingham", "liverpool", "leeds", "sheffield", "bristol", "cardiff", "belfast", "cork", "galway", "limerick", "waterford", "kilkenny", "drogheda", "wicklow", "wexford", "carlow", "laois", "offaly", "westmeath", "longford", "louth", "meath", "cavan", "monaghan", "fermanagh", "tyrone", "derry", "antrim", "down", "armagh"}
             
             # Check for comparison keywords in any message
-            has_comparison_keywords = any(word in all_messages_text for word in ["between", "vs", "versus", "or", "compare", "comparison", "which", "rather", "instead"])
+            has_comparison_keywords = bool(all_signals & _COMPARISON_BIT)
             
             # Count cities mentioned across all messages
             found_cities = set()
@@ -243,17 +589,15 @@ class VacationIntelligenceService:
                 if city in all_messages_text:
                     found_cities.add(city)
             
-            preference_words = [
-                'want', 'prefer', 'looking for', 'interested in', 'options', 'ideas', 'experience', 'adventure', 'culture', 'food', 'local', 'not luxury', 'not expensive', 'not costly', 'not pricey', 'affordable', 'cheap', 'budget-friendly', 'save', 'explore', 'try', 'see', 'do', 'enjoy', 'fun', 'relax', 'discover', 'learn', 'meet', 'connect', 'enrich', 'grow', 'enjoyable', 'memorable', 'unique', 'special', 'different', 'variety', 'diverse', 'broad', 'wide', 'range', 'choice', 'select', 'pick', 'choose', 'decide', 'consider', 'think', 'plan', 'dream', 'wish', 'hope', 'aspire', 'goal', 'aim', 'objective', 'target', 'purpose', 'reason', 'motivation', 'drive', 'passion', 'interest', 'curious', 'curiosity']
             # Priority 1: If multiple destinations and comparison keywords, force comparing
             if len(found_cities) >= 2 and has_comparison_keywords:
                 explicit_stage_override = "comparing"
             # Priority 2: If budget is mentioned but not strong planning/duration, and the latest message is about preferences/interests, set exploring as primary
             elif has_budget and not (has_planning or has_duration):
-                if any(word in latest_message_lower for word in preference_words):
+                if has_preference:
                     explicit_stage_override = "exploring"
             # Priority 3: If any message contains 'tight budget', 'limited budget', 'small budget', and latest message is about preferences/interests, set exploring
-            elif any(phrase in all_messages_text for phrase in ["tight budget", "limited budget", "small budget", "low budget", "restricted budget"]) and any(word in latest_message_lower for word in preference_words):
+            elif all_signals & _TIGHT_BUDGET_BIT and has_preference:
                 explicit_stage_override = "exploring"
         
         # Normalize scores and find the highest
@@ -325,19 +669,17 @@ class VacationIntelligenceService:
         
         detected_interests = []
         interest_scores = {}
+        contains = text.__contains__
         
         for interest, data in interest_patterns.items():
-            score = 0
-            for keyword in data["keywords"]:
-                if keyword in text:
-                    score += data["weight"]
+            score = sum(map(contains, data["keywords"])) * data["weight"]
             
             if score > 0:
                 interest_scores[interest] = score
         
         # Add 'budget' if they mention money stuff
         budget_keywords = ["budget", "cheap", "affordable", "economical", "save", "cost", "price", "money"]
-        if any(word in text for word in budget_keywords):
+        if any(map(contains, budget_keywords)):
             detected_interests.append("budget")
         
         # Sort by score and return the top interests
@@ -361,14 +703,13 @@ class VacationIntelligenceService:
                     
                     # Check each known destination
                     for known_dest in known_destinations:
-                        if known_dest.lower() in text_lower:
-                            start_idx = text_lower.find(known_dest.lower())
-                            if start_idx != -1:
-                                end_idx = start_idx + len(known_dest)
-                                matched_text = original_text[start_idx:end_idx]
-                                if matched_text and matched_text not in destinations:
-                                    destinations.append(matched_text)
-                                    logger.debug(f"Found destination '{matched_text}' from known list")
+                        start_idx = text_lower.find(known_dest.lower())
+                        if start_idx != -1:
+                            end_idx = start_idx + len(known_dest)
+                            matched_text = original_text[start_idx:end_idx]
+                            if matched_text:
+                                destinations.append(matched_text)
+                                logger.debug(f"Found destination '{matched_text}' from known list")
         except Exception as e:
             logger.warning(f"Error loading known destinations: {e}")
         
@@ -394,7 +735,7 @@ class VacationIntelligenceService:
                     parts = re.split(r",\s*|\s+and\s+", match)
                     for part in parts:
                         city = part.strip()
-                        if city and city not in destinations:
+                        if city:
                             destinations.append(city)
                 # Try the other patterns
                 for pattern in destination_patterns:
@@ -404,32 +745,23 @@ class VacationIntelligenceService:
                         if (dest and len(dest) > 2 and 
                             dest not in ["I", "We", "The", "This", "That", "My", "Our", "Plan", "Want", "Trip"] and
                             not dest.startswith("I ") and
-                            not any(word in dest.lower() for word in ["plan", "want", "trip", "vacation", "holiday"])):
-                            if dest not in destinations:
-                                destinations.append(dest)
+                            not any(map(dest.lower().__contains__, ["plan", "want", "trip", "vacation", "holiday"]))):
+                            destinations.append(dest)
                 # Last resort: look for any capitalized words (probably city/country names)
                 fallback_cities = re.findall(r"\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)\b", text)
                 for city in fallback_cities:
-                    if (city not in destinations and 
-                        city not in ["I", "We", "The", "This", "That", "My", "Our", "Plan", "Want", "Trip", "Vacation", "Holiday"] and
+                    if (city not in ["I", "We", "The", "This", "That", "My", "Our", "Plan", "Want", "Trip", "Vacation", "Holiday"] and
                         len(city) > 2):
                         destinations.append(city)
         
-        # Filter out common verbs and non-destination words
-        common_verbs = {
-            "visit", "go", "travel", "trip", "vacation", "holiday", "journey",
-            "explore", "see", "tour", "tourist", "tourists", "traveling", "travelling",
-            "plan", "planning", "want", "wants", "would", "like", "love", "dream",
-            "thinking", "considering", "interested", "looking", "hoping", "wishing"
-        }
-        
-        # Get rid of duplicates and filter out verbs, but keep the order
+        # Duplicates are only removed here, in one pass that also filters out
+        # verbs and keeps the order
         seen = set()
         unique_destinations = []
         for dest in destinations:
             dest_lower = dest.lower().strip()
             # Skip if it's a common verb or already seen
-            if dest_lower in common_verbs or dest_lower in seen:
+            if dest_lower in _COMMON_VERBS or dest_lower in seen:
                 continue
             seen.add(dest_lower)
             unique_destinations.append(dest)
@@ -478,18 +810,37 @@ Examples:
 - "No specific place yet" → []
 """
             
-            # Make a quick API call for extraction
-            response = self.openai_service.client.chat.completions.create(
+            # Make a streamed API call for extraction. The token ceiling leaves
+            # room for long lists; the loop below stops once the array closes
+            stream = self.openai_service.client.chat.completions.create(
                 model=self.openai_service.model,
                 messages=[
                     {"role": "system", "content": "You are a travel destination extraction assistant. Extract destinations from user messages and return only a JSON array."},
                     {"role": "user", "content": extraction_prompt}
                 ],
                 temperature=0.1,
-                max_tokens=200
+                max_tokens=200,
+                stream=True
             )
             
-            content = response.choices[0].message.content.strip()
+            # Stop reading as soon as the JSON array is closed
+            buf = ""
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    buf += delta
+                    if "[" in buf and buf.count("]") >= buf.count("[") and buf.rstrip().endswith("]"):
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if callable(close):
+                    close()
+            
+            content = buf.strip()
             
             # Try to parse JSON from the response
             # Handle cases where response might have markdown code blocks
@@ -552,145 +903,74 @@ Examples:
     
     def _categorize_budget_amount(self, amount: int) -> str:
         if amount <= 1500:
-            return "budget"
+            return _BUDGET
         if amount <= 5000:
-            return "moderate"
-        return "luxury"
+            return _MODERATE
+        return _LUXURY
     
     def _extract_budget_amount(self, text: str) -> Optional[Dict[str, Any]]:
-        currency_patterns = [
-            r'(?P<symbol>[$€£])\s*(?P<amount>[\d,]+)',
-            r'(?P<currency>usd|eur|gbp|cad|aud|sgd|inr)\s*(?P<amount>[\d,]+)',
-            r'(?P<amount>[\d,]+)\s*(?P<currency>usd|eur|gbp|cad|aud|sgd|inr|dollars|euros|pounds|bucks)'
-        ]
-        symbol_map = {
-            "$": "$",
-            "€": "€",
-            "£": "£",
-            "usd": "$",
-            "dollars": "$",
-            "bucks": "$",
-            "eur": "€",
-            "euros": "€",
-            "gbp": "£",
-            "pounds": "£",
-            "cad": "$",
-            "aud": "$",
-            "sgd": "$",
-            "inr": "₹"
+        parsed = _parse_budget_amount(text)
+        if parsed is None:
+            return None
+        amount_value, symbol = parsed
+        return {
+            "amount": amount_value,
+            "symbol": symbol,
+            "formatted": f"{symbol}{amount_value:,.0f}"
         }
-        for pattern in currency_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                amount_str = match.group("amount")
-                digits = re.sub(r"[^\d]", "", amount_str)
-                if not digits:
-                    continue
-                amount_value = int(digits)
-                raw_currency = match.groupdict().get("symbol") or match.groupdict().get("currency")
-                currency_key = raw_currency.lower() if isinstance(raw_currency, str) else raw_currency
-                symbol = symbol_map.get(currency_key, "$")
-                formatted = f"{symbol}{amount_value:,.0f}"
-                return {
-                    "amount": amount_value,
-                    "symbol": symbol,
-                    "formatted": formatted
-                }
-        return None
     
-    def _detect_budget_level(self, text: str, amount_info: Optional[Dict[str, Any]] = None) -> List[str]:
+    def _detect_budget_level(
+        self,
+        text: str,
+        amount_info: Optional[Dict[str, Any]] = None,
+        hits: Optional[FrozenSet[Tuple[str, str]]] = None
+    ) -> List[str]:
         # See what kind of budget they're thinking about.
-        budget_indicators = []
-        
-        budget_patterns = {
-            "ultra_budget": {
-                "keywords": ["backpack", "hostel", "cheapest", "shoestring", "broke"],
-                "phrases": ["as cheap as possible", "very tight budget", "no money"]
-            },
-            "budget": {
-                "keywords": ["budget", "cheap", "affordable", "economical", "save"],
-                "phrases": ["on a budget", "save money", "cost conscious", "good value"]
-            },
-            "moderate": {
-                "keywords": ["moderate", "comfortable", "reasonable", "balanced"],
-                "phrases": ["mid-range", "not too expensive", "decent hotels", "some nice meals"]
-            },
-            "luxury": {
-                "keywords": ["luxury", "premium", "exclusive", "splurge", "best"],
-                "phrases": ["five star", "no budget", "money no object", "treat ourselves"]
-            }
-        }
+        if hits is None:
+            hits = _standalone_detector_hits(text)
         
         if amount_info is None:
             amount_info = self._extract_budget_amount(text)
         
+        budget_indicators: List[str] = []
         if amount_info and amount_info.get("amount"):
             category = self._categorize_budget_amount(amount_info["amount"])
             if category:
                 budget_indicators.append(category)
         
-        for level, patterns in budget_patterns.items():
-            # Check keywords
-            if any(keyword in text for keyword in patterns["keywords"]):
-                budget_indicators.append(level)
-            # Check phrases
-            if any(phrase in text for phrase in patterns["phrases"]):
-                budget_indicators.append(level)
+        # ultra_budget is held back: we only count it if they don't mention
+        # any other budget level
+        saw_ultra = False
+        for level, _, _ in _BUDGET_PATTERNS:
+            phrase_hit = ("budget_phrase", level) in hits
+            if phrase_hit or ("budget", level) in hits:
+                if level == _ULTRA_BUDGET:
+                    saw_ultra = True
+                elif level not in budget_indicators:
+                    budget_indicators.append(level)
+            if phrase_hit:
                 break  # Phrases are more definitive
         
-        # Don't count ultra_budget if they mention other budget levels too
-        if len(budget_indicators) > 1 and "ultra_budget" in budget_indicators:
-            budget_indicators = [b for b in budget_indicators if b != "ultra_budget"]
-        
-        unique_indicators: List[str] = []
-        for indicator in budget_indicators:
-            if indicator not in unique_indicators:
-                unique_indicators.append(indicator)
+        if saw_ultra and not budget_indicators:
+            budget_indicators.append(_ULTRA_BUDGET)
         
-        return unique_indicators
+        return budget_indicators
     
-    def _detect_concerns(self, text: str) -> List[str]:
+    def _detect_concerns(self, text: str, hits: Optional[FrozenSet[Tuple[str, str]]] = None) -> List[str]:
         # Find any worries or concerns they might have.
-        concerns = []
-        
-        concern_patterns = {
-            "safety": ["safe", "dangerous", "crime", "secure", "risk", "safety"],
-            "health": ["health", "medical", "hospital", "vaccine", "illness", "doctor"],
-            "weather": ["weather", "rain", "hot", "cold", "hurricane", "climate", "season"],
-            "crowds": ["crowd", "busy", "tourist", "peaceful", "quiet", "packed", "overcrowded"],
-            "language": ["language", "english", "speak", "communicate", "understand"],
-            "cost": ["expensive", "cost", "price", "afford", "budget", "money"],
-            "solo_travel": ["alone", "solo", "single", "by myself", "solo travel"],
-            "accessibility": ["wheelchair", "accessible", "disability", "mobility"],
-            "dietary": ["vegetarian", "vegan", "allergy", "dietary", "food restrictions"],
-            "visa": ["visa", "passport", "documentation", "entry requirements"]
-        }
-        
-        for concern_type, keywords in concern_patterns.items():
-            if any(keyword in text for keyword in keywords):
-                concerns.append(concern_type)
+        if hits is None:
+            hits = _standalone_detector_hits(text)
         
-        return list(set(concerns))
+        # Keep the order concerns are declared in, so concerns[0] is stable
+        return [label for label, _ in _CONCERN_PATTERNS if ("concern", label) in hits]
     
-    def _detect_experience_level(self, text: str) -> str:
+    def _detect_experience_level(self, text: str, hits: Optional[FrozenSet[Tuple[str, str]]] = None) -> str:
         # See how experienced they are with travel.
-        experience_indicators = {
-            "beginner": [
-                "first time", "never been", "new to travel", "nervous about",
-                "worried about", "inexperienced", "first international"
-            ],
-            "intermediate": [
-                "traveled before", "been to a few", "some experience",
-                "comfortable with", "done this before"
-            ],
-            "experienced": [
-                "traveled extensively", "been everywhere", "seasoned traveler",
-                "always traveling", "travel frequently", "been to many"
-            ]
-        }
+        if hits is None:
+            hits = _standalone_detector_hits(text)
         
-        for level, indicators in experience_indicators.items():
-            if any(indicator in text for indicator in indicators):
+        for level, _ in _EXPERIENCE_PATTERNS:
+            if ("experience", level) in hits:
                 return level
         
         return "unknown"
@@ -702,109 +982,43 @@ Examples:
     ) -> List[str]:
         # Come up with helpful suggestions based on what the user is thinking about.
         suggestions = []
-        stage = conversation_state.get("decision_stage", "exploring")
-        confidence = conversation_state.get("stage_confidence", 0)
-        interests = conversation_state.get("detected_interests", [])
-        readiness = conversation_state.get("decision_readiness", 0)
-        mentioned_destinations = conversation_state.get("mentioned_destinations", [])
-        concerns = conversation_state.get("concerns", [])
+        stage, confidence, interests, readiness, mentioned_destinations, concerns = _unpack_insights(
+            conversation_state
+        )
         
         # See if they just mentioned a place
         last_lower = last_message.lower()
-        just_mentioned_destination = any(dest.lower() in last_lower for dest in mentioned_destinations)
+        just_mentioned_destination = any(
+            map(last_lower.__contains__, _lowered(tuple(mentioned_destinations)))
+        )
         
         # If they just mentioned a place, give them helpful follow-up questions
         if just_mentioned_destination and mentioned_destinations:
             dest = mentioned_destinations[0]
-            suggestions = [
+            return [
                 f"Tell me more about {dest}",
                 "When do you want to go?",
                 "What's your budget like?",
                 "What kind of activities do you enjoy?"
             ]
-            return suggestions[:4]
         
         # If we're pretty sure about where they are, give them specific suggestions
         if confidence > 0.6:
-            if stage == "exploring":
-                if interests:
-                    suggestions.append(f"Best places for {interests[0]}")
-                    suggestions.append("Match my travel style")
-                else:
-                    suggestions.append("Help me find inspiration")
-                    suggestions.append("What's popular right now")
-                
-                if not mentioned_destinations:
-                    suggestions.append("I have a place in mind")
-                    suggestions.append("Surprise me with ideas")
-                else:
-                    suggestions.append(f"Tell me about {mentioned_destinations[0]}")
-                    suggestions.append("Compare with other places")
-                    
-            elif stage == "comparing":
-                if mentioned_destinations and len(mentioned_destinations) >= 2:
-                    suggestions.append(f"Compare {mentioned_destinations[0]} vs {mentioned_destinations[1]}")
-                    suggestions.append("Which one is better for me?")
-                suggestions.append("Compare costs")
-                suggestions.append("Best time to visit")
-                    
-            elif stage == "planning":
-                if mentioned_destinations:
-                    dest = mentioned_destinations[0]
-                    suggestions.append(f"Create {dest} itinerary")
-                    suggestions.append(f"Where to stay in {dest}")
-                    suggestions.append(f"Must-see in {dest}")
-                else:
-                    suggestions.append("Create an itinerary")
-                    suggestions.append("Where to stay")
-                    suggestions.append("Must-see attractions")
-                suggestions.append("Getting around tips")
-                    
-            elif stage == "finalizing":
-                suggestions.append("When should I book?")
-                suggestions.append("What documents do I need?")
-                suggestions.append("Travel insurance advice")
-                suggestions.append("Final checklist")
+            suggest = self._stage_suggesters.get(stage)
+            if suggest:
+                suggestions = suggest(interests, mentioned_destinations)
         
         # If we're not sure where they are, help them figure it out
         else:
-            if not mentioned_destinations:
-                suggestions = [
-                    "I need some ideas",
-                    "Beach vacation ideas",
-                    "Adventure travel ideas",
-                    "City break ideas"
-                ]
-            elif readiness < 0.3:
-                suggestions = [
-                    f"Tell me about {mentioned_destinations[0]}" if mentioned_destinations else "I need inspiration",
-                    "When should I travel?",
-                    "What's my budget?",
-                    "Who's coming with me?"
-                ]
-            elif readiness < 0.6:
-                suggestions = [
-                    "Help me plan activities",
-                    "Where should I stay?",
-                    "Compare with similar places",
-                    "What's the weather like?"
-                ]
-            else:
-                suggestions = [
-                    "Review my travel plan",
-                    "What am I forgetting?",
-                    "Booking tips",
-                    "Local customs to know"
-                ]
+            suggestions = self._suggest_by_readiness(mentioned_destinations, readiness)
         
-        # Help with any worries they might have
+        # Help with the most pressing worry they might have
         if concerns:
-            if "safety" in concerns:
-                suggestions.insert(0, "Is it safe to travel there?")
-            elif "budget" in concerns:
-                suggestions.insert(0, "How can I save money?")
-            elif "weather" in concerns:
-                suggestions.insert(0, "What's the weather like?")
+            concern_set = set(concerns)
+            for concern in _CONCERN_PRIORITY:
+                if concern in concern_set and concern in _CONCERN_SUGGESTIONS:
+                    suggestions.insert(0, _CONCERN_SUGGESTIONS[concern])
+                    break
         
         # If they asked a question, offer to help more
         if "?" in last_message:
@@ -813,14 +1027,56 @@ Examples:
                 suggestions.append("I need more information")
         
         # Get rid of duplicates but keep the order
-        seen = set()
-        unique_suggestions = []
-        for s in suggestions:
-            if s not in seen:
-                seen.add(s)
-                unique_suggestions.append(s)
+        return _first_unique(suggestions, 4)
+    
+    def _suggest_exploring(self, interests: List[str], mentioned_destinations: List[str]) -> List[str]:
+        if interests:
+            suggestions = [f"Best places for {interests[0]}", "Match my travel style"]
+        else:
+            suggestions = ["Help me find inspiration", "What's popular right now"]
         
-        return unique_suggestions[:4]
+        if not mentioned_destinations:
+            suggestions += ["I have a place in mind", "Surprise me with ideas"]
+        else:
+            suggestions += [f"Tell me about {mentioned_destinations[0]}", "Compare with other places"]
+        return suggestions
+    
+    def _suggest_comparing(self, interests: List[str], mentioned_destinations: List[str]) -> List[str]:
+        suggestions = []
+        if len(mentioned_destinations) >= 2:
+            suggestions += [
+                f"Compare {mentioned_destinations[0]} vs {mentioned_destinations[1]}",
+                "Which one is better for me?"
+            ]
+        suggestions += ["Compare costs", "Best time to visit"]
+        return suggestions
+    
+    def _suggest_planning(self, interests: List[str], mentioned_destinations: List[str]) -> List[str]:
+        if mentioned_destinations:
+            dest = mentioned_destinations[0]
+            suggestions = [f"Create {dest} itinerary", f"Where to stay in {dest}", f"Must-see in {dest}"]
+        else:
+            suggestions = ["Create an itinerary", "Where to stay", "Must-see attractions"]
+        suggestions.append("Getting around tips")
+        return suggestions
+    
+    def _suggest_finalizing(self, interests: List[str], mentioned_destinations: List[str]) -> List[str]:
+        return ["When should I book?", "What documents do I need?", "Travel insurance advice", "Final checklist"]
+    
+    def _suggest_by_readiness(self, mentioned_destinations: List[str], readiness: float) -> List[str]:
+        # Used when we're not sure which stage they're in.
+        if not mentioned_destinations:
+            return ["I need some ideas", "Beach vacation ideas", "Adventure travel ideas", "City break ideas"]
+        if readiness < 0.3:
+            return [
+                f"Tell me about {mentioned_destinations[0]}",
+                "When should I travel?",
+                "What's my budget?",
+                "Who's coming with me?"
+            ]
+        if readiness < 0.6:
+            return ["Help me plan activities", "Where should I stay?", "Compare with similar places", "What's the weather like?"]
+        return ["Review my travel plan", "What am I forgetting?", "Booking tips", "Local customs to know"]
     
     def get_smart_recommendations(
         self,
@@ -829,99 +1085,48 @@ Examples:
         message_count: int
     ) -> List[Dict]:
         # Give them helpful recommendations based on what we know about them.
-        recommendations = []
+        # Candidates are queued as (type, template, format fields) and only the
+        # ones we actually return get their content built.
+        candidates: List[Tuple[str, str, Optional[Dict[str, str]]]] = []
         
-        stage = insights.get("decision_stage", "exploring")
-        confidence = insights.get("stage_confidence", 0)
-        interests = insights.get("detected_interests", [])
-        concerns = insights.get("concerns", [])
-        readiness = insights.get("decision_readiness", 0)
-        mentioned_destinations = insights.get("mentioned_destinations", [])
+        stage, confidence, interests, readiness, mentioned_destinations, concerns = _unpack_insights(insights)
         
         # Give them a friendly welcome if they're just starting
         if message_count <= 3:
-            recommendations.append({
-                "type": "welcome",
-                "content": "👋 **Welcome to Vacation Planning!**\n\n" +
-                          "I'm here to help you plan your perfect trip. " +
-                          "Let's start by understanding what you're dreaming of for your vacation."
-            })
+            candidates.append(("welcome", _WELCOME_MSG, None))
         
         # Give them specific help based on where they are in planning
         if confidence > 0.6:
             if stage == "exploring" and interests:
                 interest_text = interests[0]
-                recommendations.append({
-                    "type": "targeted_inspiration",
-                    "content": f"🎯 **Perfect for {interest_text.title()} Lovers**\n\n" +
-                              f"Since you're into {interest_text}, think about:\n" +
-                              f"• **Tropical Paradise** - Beach resorts with {interest_text} activities\n" +
-                              f"• **Mountain Escapes** - High-altitude {interest_text} experiences\n" +
-                              f"• **Cultural Hubs** - Cities known for {interest_text}\n\n" +
-                              f"What kind of setting sounds most appealing to you?"
-                })
+                candidates.append((
+                    "targeted_inspiration",
+                    _TARGETED_INSPIRATION_TMPL,
+                    {"interest_title": interest_text.title(), "interest": interest_text}
+                ))
             
             elif stage == "comparing" and mentioned_destinations:
-                destinations = mentioned_destinations[:2]
-                recommendations.append({
-                    "type": "comparison_framework",
-                    "content": "📊 **Smart Comparison Framework**\n\n" +
-                              "To help you decide, think about:\n" +
-                              "• **Total Cost** (flights + accommodation + activities)\n" +
-                              "• **Weather** during your travel period\n" +
-                              "• **Activities** that match your interests\n" +
-                              "• **Travel Time** and convenience\n" +
-                              "• **Visa Requirements** and ease of entry\n\n" +
-                              "Which factor matters most to you?"
-                })
+                candidates.append(("comparison_framework", _COMPARISON_FRAMEWORK_MSG, None))
             
             elif stage == "planning":
-                recommendations.append({
-                    "type": "planning_structure",
-                    "content": "📅 **Smart Planning Approach**\n\n" +
-                              "Let's structure your trip:\n" +
-                              "1. **Arrival & Settling** (Day 1)\n" +
-                              "2. **Major Attractions** (Days 2-3)\n" +
-                              "3. **Local Experiences** (Days 4-5)\n" +
-                              "4. **Hidden Gems** (Day 6)\n" +
-                              "5. **Departure Prep** (Last Day)\n\n" +
-                              "How many days are you thinking of staying?"
-                })
+                candidates.append(("planning_structure", _PLANNING_STRUCTURE_MSG, None))
         
         # Give them specific help for places they mentioned
         if mentioned_destinations:
-            dest = mentioned_destinations[0]
-            recommendations.append({
-                "type": "destination_focus",
-                "content": f"🗺️ **{dest} Highlights**\n\n" +
-                          f"I can help you discover the best of {dest}:\n" +
-                          f"• **Must-See Attractions**\n" +
-                          f"• **Local Cuisine & Dining**\n" +
-                          f"• **Hidden Gems**\n" +
-                          f"• **Best Neighborhoods**\n" +
-                          f"• **Practical Tips**\n\n" +
-                          f"What interests you most about {dest}?"
-            })
-        
-        # Help with any worries they mentioned
+            candidates.append((
+                "destination_focus", _DESTINATION_FOCUS_TMPL, {"dest": mentioned_destinations[0]}
+            ))
+        
+        # Help with the most pressing worry they mentioned
         if concerns:
-            primary_concern = concerns[0]
-            concern_responses = {
-                "safety": "🔒 **Safety First**: I'll focus on safe neighborhoods, reliable transportation, and current travel advisories.",
-                "budget": "💰 **Budget-Conscious Planning**: Let's find great value options and money-saving tips.",
-                "weather": "🌤️ **Weather Considerations**: I'll help you pick the best time and prepare for conditions.",
-                "language": "🗣️ **Communication Tips**: I'll share key phrases and apps to help you communicate.",
-                "health": "🏥 **Health Preparedness**: Let's cover vaccinations, insurance, and medical facilities."
-            }
-            
-            if primary_concern in concern_responses:
-                recommendations.append({
-                    "type": "concern_addressed",
-                    "content": concern_responses[primary_concern]
-                })
+            concern_set = set(concerns)
+            for concern in _CONCERN_PRIORITY:
+                if concern in concern_set and concern in _CONCERN_RESPONSES:
+                    candidates.append(("concern_addressed", _CONCERN_RESPONSES[concern], None))
+                    break
         
         # If they're almost ready to decide, help them finish up
-        if readiness > 0.7 and stage != "finalizing":
+        if readiness > 0.7 and stage != "finalizing" and len(candidates) < 3:
             missing_elements = []
             if not preferences or not preferences.get("destinations"):
                 missing_elements.append("destination")
@@ -931,42 +1136,21 @@ Examples:
                 missing_elements.append("budget")
             
             if missing_elements:
-                recommendations.append({
-                    "type": "readiness_prompt",
-                    "content": f"✅ **Almost Ready!** Just need your {' and '.join(missing_elements)} to create a complete plan."
-                })
+                candidates.append((
+                    "readiness_prompt", _READINESS_PROMPT_TMPL, {"missing": ' and '.join(missing_elements)}
+                ))
         
         # Give them general help based on where they are
         if stage == "exploring":
-            recommendations.append({
-                "type": "exploration_guidance",
-                "content": "🌟 **Let's Find Your Perfect Destination**\n\n" +
-                          "I can help you discover:\n" +
-                          "• **Beach Getaways** - Relaxation and water activities\n" +
-                          "• **City Breaks** - Culture, food, and urban adventures\n" +
-                          "• **Mountain Escapes** - Hiking and outdoor activities\n" +
-                          "• **Cultural Journeys** - History, art, and local traditions\n\n" +
-                          "What kind of experience are you dreaming of?"
-            })
+            candidates.append(("exploration_guidance", _EXPLORATION_GUIDANCE_MSG, None))
         elif stage == "planning":
-            recommendations.append({
-                "type": "planning_guidance",
-                "content": "📋 **Let's Build Your Perfect Itinerary**\n\n" +
-                          "I can help you plan:\n" +
-                          "• **Daily Schedules** - Optimized for your interests\n" +
-                          "• **Accommodation** - Best areas and options\n" +
-                          "• **Transportation** - Getting around efficiently\n" +
-                          "• **Local Tips** - Insider knowledge and advice\n\n" +
-                          "What would you like to focus on first?"
-            })
+            candidates.append(("planning_guidance", _PLANNING_GUIDANCE_MSG, None))
         
         # Ensure we provide helpful recommendations
-        if not recommendations:
-            recommendations.append({
-                "type": "general_guidance",
-                "content": "🎯 **Let's Plan Your Perfect Trip**\n\n" +
-                          "I'm here to help you create an amazing vacation experience. " +
-                          "Tell me about your travel dreams and I'll guide you every step of the way!"
-            })
-        
-        return recommendations[:3]
\ No newline at end of file
+        if not candidates:
+            candidates.append(("general_guidance", _GENERAL_GUIDANCE_MSG, None))
+        
+        return [
+            {"type": rec_type, "content": template.format(**fields) if fields else template}
+            for rec_type, template, fields in candidates[:3]
+        ]
\ No newline at end of file
@@ -1,134 +1,359 @@
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Words that sometimes get picked up as destinations but aren't places
+_NOT_DESTINATIONS = frozenset({
+    "visit", "go", "travel", "trip", "vacation", "holiday", "journey",
+    "explore", "see", "tour", "plan", "planning", "want", "like", "love"
+})
+
+# Words that mark a destination as a landmark rather than a city/country
+_LANDMARK_RE = re.compile(r"tower|palace|temple|monument|museum|bridge|cathedral|mosque", re.IGNORECASE)
+
+# Summary recommendation templates
+_BUDGET_RECOMMENDATIONS = {
+    "budget": "For your budget-friendly trip to {dest}, look for free walking tours, street food, and local markets.",
+    "luxury": "For your luxury trip to {dest}, consider private guides, fine dining, and exclusive experiences."
+}
+_DEFAULT_BUDGET_RECOMMENDATION = (
+    "For your {budget} trip to {dest}, mix famous attractions with local experiences and food tours."
+)
+
+# Travel styles with their own recommendation, in priority order
+_STYLE_RECOMMENDATIONS = (
+    ("adventure", "Since you love adventure, plan hikes and outdoor activities in {dest}."),
+    ("relaxation", "Since relaxation matters, add spa time and scenic strolls in {dest}."),
+    ("food", "As a food lover, try markets, street food, and cooking classes in {dest}."),
+    ("foodie", "As a food lover, try markets, street food, and cooking classes in {dest}.")
+)
+_INTERESTS_RECOMMENDATION = "Plan your days in {dest} around your interests: {styles}."
+_NO_STYLE_RECOMMENDATION = "Plan your days in {dest} around local cuisine, cultural sites, and hidden gems."
+
+_DATES_SET_RECOMMENDATION = "Since your dates are set, check the forecast for {dest} and pack accordingly."
+_NO_DATES_RECOMMENDATION = "Don't forget to research the best time to visit {dest} before choosing dates."
+
+# Activity templates for the cities we know well, keyed by lowercase name
+_CITY_ACTIVITY_TEMPLATES = {
+    "paris": (
+        "Visit the Eiffel Tower in {dest}",
+        "Explore the Louvre Museum in {dest}",
+        "Walk along the Champs-Élysées in {dest}",
+        "Take a Seine River cruise in {dest}",
+        "Visit Notre-Dame Cathedral in {dest}"
+    ),
+    "tokyo": (
+        "Visit Senso-ji Temple in {dest}",
+        "Explore Shibuya Crossing in {dest}",
+        "Visit the Tokyo Skytree in {dest}",
+        "Walk through Meiji Shrine in {dest}",
+        "Experience Tsukiji Fish Market in {dest}"
+    ),
+    "bali": (
+        "Visit Tanah Lot Temple in {dest}",
+        "Explore Ubud Monkey Forest in {dest}",
+        "Relax at Nusa Dua Beach in {dest}",
+        "Take a rice terrace tour in {dest}",
+        "Experience traditional Balinese dance in {dest}"
+    )
+}
+
+# Activities for anywhere else
+_GENERIC_ACTIVITY_TEMPLATES = (
+    "Explore the main attractions in {dest}",
+    "Visit local museums and cultural sites in {dest}",
+    "Try local cuisine in {dest}",
+    "Take a guided tour of {dest}",
+    "Experience local markets in {dest}"
+)
+
+# Daily budget estimate for each budget tier
+_BUDGET_ESTIMATES = {
+    "budget": {"min": 50, "max": 150, "currency": "USD"},
+    "luxury": {"min": 300, "max": 1000, "currency": "USD"},
+    "moderate": {"min": 150, "max": 300, "currency": "USD"}
+}
+
+# Where to stay for each budget tier, as (type, description template)
+_ACCOMMODATION_TEMPLATES = {
+    "budget": (
+        ("Hostel", "Budget-friendly hostels in {dest}"),
+        ("Guesthouse", "Local guesthouses in {dest}"),
+        ("Budget Hotel", "Affordable hotels in {dest}")
+    ),
+    "luxury": (
+        ("Luxury Hotel", "5-star hotels in {dest}"),
+        ("Resort", "Exclusive resorts in {dest}"),
+        ("Boutique Hotel", "Luxury boutique hotels in {dest}")
+    ),
+    "moderate": (
+        ("Hotel", "Comfortable hotels in {dest}"),
+        ("Apartment", "Vacation rentals in {dest}"),
+        ("B&B", "Bed and breakfasts in {dest}")
+    )
+}
+
+_TRANSPORTATION_TEMPLATES = (
+    ("Public Transit", "Metro, buses, and trains in {dest}"),
+    ("Walking", "Explore {dest} on foot"),
+    ("Bicycle", "Rent a bike to explore {dest}"),
+    ("Taxi/Rideshare", "Convenient transportation in {dest}")
+)
+
+_LOCAL_TIP_TEMPLATES = (
+    "Learn a few basic phrases in the local language of {dest}.",
+    "Research local customs and etiquette in {dest}.",
+    "Check the weather forecast for {dest} before packing.",
+    "Download offline maps for {dest} and mark key spots.",
+    "Keep emergency contact numbers handy while traveling in {dest}."
+)
+
+_WEATHER_TEMPLATES = (
+    ("current", "Check local weather forecast for {dest} before departure."),
+    ("best_months", "Research the best time to visit {dest} for ideal weather."),
+    ("packing_tips", "Pack layers and comfortable shoes to adapt to activities.")
+)
+
+_ITINERARY_TEMPLATES = (
+    "Explore {dest}",
+    "Visit local attractions in {dest}",
+    "Enjoy local cuisine in {dest}"
+)
+
+_BEST_TIME_TEMPLATE = "Research the best time to visit {dest} based on weather and local events."
+
+
+def _budget_tier(budget_range) -> str:
+    # Anything other than "budget" or "luxury" is planned as moderate.
+    return budget_range if budget_range in ("budget", "luxury") else "moderate"
+
+
+def _typed_options(options: Tuple[Tuple[str, str], ...]) -> List[Dict]:
+    # Fresh {"type", "description"} dicts from cached (type, description) pairs.
+    return [{"type": kind, "description": description} for kind, description in options]
+
+
+# The same few destinations come up again and again, so the filled-in text
+# is cached per destination. Cached values are tuples; the planner hands out
+# fresh lists/dicts built from them.
+@lru_cache(maxsize=128)
+def _destination_activities(destination: str) -> Tuple[str, ...]:
+    dest_lower = destination.lower()
+    templates = _CITY_ACTIVITY_TEMPLATES.get(dest_lower)
+    if templates is None:
+        # Not an exact match, so look for a known city inside the name ("Paris, France")
+        templates = next(
+            (city_templates for city, city_templates in _CITY_ACTIVITY_TEMPLATES.items() if city in dest_lower),
+            _GENERIC_ACTIVITY_TEMPLATES
+        )
+    return tuple(template.format(dest=destination) for template in templates)
+
+
+@lru_cache(maxsize=128)
+def _accommodation_options(destination: str, tier: str) -> Tuple[Tuple[str, str], ...]:
+    return tuple(
+        (kind, template.format(dest=destination)) for kind, template in _ACCOMMODATION_TEMPLATES[tier]
+    )
+
+
+@lru_cache(maxsize=128)
+def _transportation_options(destination: str) -> Tuple[Tuple[str, str], ...]:
+    return tuple((kind, template.format(dest=destination)) for kind, template in _TRANSPORTATION_TEMPLATES)
+
+
+@lru_cache(maxsize=128)
+def _local_tips(destination: str) -> Tuple[str, ...]:
+    return tuple(template.format(dest=destination) for template in _LOCAL_TIP_TEMPLATES)
+
+
+@lru_cache(maxsize=128)
+def _itinerary_activities(destination: str) -> Tuple[str, ...]:
+    return tuple(template.format(dest=destination) for template in _ITINERARY_TEMPLATES)
+
+
+@lru_cache(maxsize=128)
+def _weather_info(destination: str) -> Tuple[Tuple[str, str], ...]:
+    return tuple((key, template.format(dest=destination)) for key, template in _WEATHER_TEMPLATES)
+
+
+def _clean_destination(dest) -> str:
+    return dest.strip() if isinstance(dest, str) else str(dest)
+
+
+def _primary_destination(destinations) -> str:
+    # The first destination if we have a list of them, tidied up for display.
+    if isinstance(destinations, list) and destinations:
+        return _clean_destination(destinations[0])
+    return _clean_destination(destinations)
+
+
+def _filled_mask(preferences: Dict, fields: Tuple[str, ...]) -> int:
+    # One bit per field (bit i for fields[i]), set when the user has given it.
+    mask = 0
+    get = preferences.get
+    for bit, field in enumerate(fields):
+        if get(field):
+            mask |= 1 << bit
+    return mask
+
+
+def _completeness_pct(completed: int, total: int) -> int:
+    # Whole-number percentage of the essential fields that are filled in.
+    return completed * 100 // total
+
+
+@lru_cache(maxsize=256)
+def _trip_length_days(start: str, end: str) -> int:
+    # Only the calendar dates matter for the trip length, so parse just the
+    # date part. Reversed dates are swapped and trips are capped at 30 days.
+    start_date = date.fromisoformat(start[:10])
+    end_date = date.fromisoformat(end[:10])
+    if end_date < start_date:
+        start_date, end_date = end_date, start_date
+    return min((end_date - start_date).days + 1, 30)
+
+
+# Summary status by minimum completeness percentage, highest first
+_STATUS_BUCKETS = (
+    (80, "Great! You're almost ready to go!"),
+    (60, "Good progress! Just a few more details to nail down."),
+    (40, "Getting there! You've got the basics covered."),
+    (0, "Just getting started! Let's fill in some more details.")
+)
+
+# The same thing spelled out for every percentage, so a lookup is one index
+_STATUS_TABLE = tuple(
+    next(status for threshold, status in _STATUS_BUCKETS if completeness >= threshold)
+    for completeness in range(101)
+)
+
 
 class VacationPlanner:
     # Generates vacation suggestions, plans, and summaries.
 
+    # What we suggest before we know where they want to go
+    _DEFAULT_SUGGESTIONS = (
+        "Tell me about your dream destination",
+        "What's your budget like?",
+        "When do you want to travel?",
+        "What kind of activities do you enjoy?"
+    )
+
+    # Follow-up prompts for details we don't have yet, in the order we ask
+    _SUGGESTION_MAP = (
+        ("travel_dates", "When do you want to travel?"),
+        ("budget_range", "What's your budget like?"),
+        ("travel_style", "What kind of activities do you enjoy?"),
+        ("group_size", "How many people are coming with you?"),
+        ("interests", "What are you most interested in for this trip?")
+    )
+
+    # Fields that make a plan complete
+    _ESSENTIAL_FIELDS = ("destinations", "travel_dates", "budget_range", "travel_style", "group_size")
+
+    # Preferences copied into a plan/summary when the user has given them
+    _PLAN_OPTIONAL_FIELDS = ("travel_dates", "budget_range", "travel_style", "group_size", "interests")
+    _SUMMARY_OPTIONAL_FIELDS = ("budget_amount", "travel_dates", "travel_style", "group_size", "interests")
+
+    # Essentials other than the destination, with how we list them when missing
+    _SUMMARY_FIELDS = (
+        ("budget_range", "Budget range"),
+        ("travel_dates", "Travel dates"),
+        ("travel_style", "Travel style"),
+        ("group_size", "Group size")
+    )
+    _SUMMARY_FIELD_NAMES = tuple(field for field, _ in _SUMMARY_FIELDS)
+
     def __init__(self):
-        self.default_suggestions = [
-            "Tell me about your dream destination",
-            "What's your budget like?",
-            "When do you want to travel?",
-            "What kind of activities do you enjoy?"
-        ]
         self.plans_created = 0
 
+    @property
+    def default_suggestions(self) -> List[str]:
+        # A fresh list each time, so callers can't change the shared defaults
+        return list(self._DEFAULT_SUGGESTIONS)
+
     def generate_suggestions(self, preferences: Optional[Dict]) -> List[str]:
         if not preferences:
-            return list(self.default_suggestions)
+            return list(self._DEFAULT_SUGGESTIONS)
 
         destinations = preferences.get("destinations")
         if not destinations:
-            return list(self.default_suggestions)
+            return list(self._DEFAULT_SUGGESTIONS)
 
-        if isinstance(destinations, list) and destinations:
-            dest = destinations[0]
-        else:
-            dest = destinations
-        dest = dest.strip() if isinstance(dest, str) else str(dest)
+        dest = _primary_destination(destinations)
 
         suggestions: List[str] = [f"Tell me more about your plans for {dest}."]
-        missing_prompts = [
-            ("travel_dates", "When do you want to travel?"),
-            ("budget_range", "What's your budget like?"),
-            ("travel_style", "What kind of activities do you enjoy?"),
-            ("group_size", "How many people are coming with you?"),
-            ("interests", "What are you most interested in for this trip?")
-        ]
-
-        for field, prompt in missing_prompts:
+        for field, prompt in self._SUGGESTION_MAP:
             if not preferences.get(field):
                 suggestions.append(prompt)
+                if len(suggestions) >= 3:
+                    break
 
-        if not suggestions:
-            return self.default_suggestions[:3]
-
-        return suggestions[:3]
+        return suggestions
 
-    def create_vacation_plan(self, preferences: Optional[Dict]) -> Optional[Dict]:
-        if not preferences or not preferences.get("destinations"):
+    def create_vacation_plan(self, preferences: Optional[Dict], now_iso: Optional[str] = None) -> Optional[Dict]:
+        # When building many plans at once, pass now_iso so they all share one timestamp.
+        if not isinstance(preferences, dict) or not preferences.get("destinations"):
             return None
 
         try:
-            destinations = preferences["destinations"]
-            if isinstance(destinations, list) and destinations:
-                dest = destinations[0]
-            else:
-                dest = destinations
-            dest = dest.strip() if isinstance(dest, str) else str(dest)
+            dest = _primary_destination(preferences["destinations"])
 
             duration_days = 7
-            if preferences.get("travel_dates"):
-                try:
-                    travel_dates = preferences["travel_dates"]
-                    start_date = datetime.fromisoformat(travel_dates["start"])
-                    end_date = datetime.fromisoformat(travel_dates["end"])
-                    if end_date < start_date:
-                        start_date, end_date = end_date, start_date
-                    duration_days = min((end_date - start_date).days + 1, 30)
-                except Exception as date_error:
-                    logger.warning(f"Had trouble with their dates: {date_error}")
-                    duration_days = 7
+            travel_dates = preferences.get("travel_dates")
+            if isinstance(travel_dates, dict):
+                start, end = travel_dates.get("start"), travel_dates.get("end")
+                if isinstance(start, str) and isinstance(end, str):
+                    try:
+                        duration_days = _trip_length_days(start, end)
+                    except ValueError as date_error:
+                        logger.warning(f"Had trouble with their dates: {date_error}")
 
             plan = {
                 "destination": dest,
                 "duration_days": duration_days,
-                "estimated_budget": self._generate_budget_estimate(preferences),
-                "suggested_activities": self._generate_destination_activities(dest, preferences),
-                "accommodation_recommendations": self._generate_accommodation_recommendations(dest, preferences),
-                "transportation_options": self._generate_transportation_options(dest, preferences),
-                "best_time_to_visit": self._generate_best_time_to_visit(dest, preferences),
-                "weather_info": self._generate_weather_info(dest, preferences),
-                "local_tips": self._generate_local_tips(dest, preferences),
-                "itinerary": self._generate_itinerary(dest, duration_days, preferences)
+                **self._build_plan_sections(dest, preferences),
+                "itinerary": self._generate_itinerary(dest, duration_days, preferences),
+                "created_at": now_iso or datetime.now().isoformat()
             }
 
             self.plans_created += 1
 
-            for field in ["travel_dates", "budget_range", "travel_style", "group_size", "interests"]:
-                if preferences.get(field):
-                    plan[field] = preferences[field]
+            for field in self._PLAN_OPTIONAL_FIELDS:
+                value = preferences.get(field)
+                if value:
+                    plan[field] = value
 
-            plan["created_at"] = datetime.now().isoformat()
             return plan
         except Exception as e:
             logger.error(f"Something went wrong while creating the vacation plan: {e}")
             return None
 
-    def create_vacation_summary(self, preferences: Optional[Dict]) -> Optional[Dict]:
-        if not preferences or not preferences.get("destinations"):
+    def create_vacation_summary(self, preferences: Optional[Dict], now_iso: Optional[str] = None) -> Optional[Dict]:
+        # Like create_vacation_plan, now_iso lets a batch reuse one timestamp.
+        if not isinstance(preferences, dict) or not preferences.get("destinations"):
             return None
 
         try:
             destinations = preferences["destinations"]
             if isinstance(destinations, list) and destinations:
-                filtered_destinations = [d for d in destinations if isinstance(d, str) and d.lower().strip() not in {
-                    "visit", "go", "travel", "trip", "vacation", "holiday", "journey",
-                    "explore", "see", "tour", "plan", "planning", "want", "like", "love"
-                }]
+                # Drop words that aren't places, and note the first place that
+                # isn't a landmark: a city/country makes a better primary
+                # destination, but landmarks stay in the list
+                filtered_destinations = []
+                first_city_country = None
+                for d in destinations:
+                    if isinstance(d, str) and d.strip().lower() not in _NOT_DESTINATIONS:
+                        filtered_destinations.append(d)
+                        if first_city_country is None and not _LANDMARK_RE.search(d):
+                            first_city_country = d
                 if filtered_destinations:
-                    # Prioritize landmarks/monuments, then cities, then countries
-                    # Sort by length (shorter = more specific landmark/city, longer = country)
-                    # But prefer cities/countries over just landmarks for the primary destination
-                    landmark_keywords = {"tower", "palace", "temple", "monument", "museum", "bridge", "cathedral", "mosque"}
-                    has_landmark = any(any(kw in d.lower() for kw in landmark_keywords) for d in filtered_destinations)
-                    
-                    if has_landmark and len(filtered_destinations) > 1:
-                        # If we have a landmark + city/country, prefer the city/country for primary, but keep landmark in the list
-                        city_country = [d for d in filtered_destinations if not any(kw in d.lower() for kw in landmark_keywords)]
-                        if city_country:
-                            dest = city_country[0]
-                            destination_list = filtered_destinations
-                        else:
-                            dest = filtered_destinations[0]
-                            destination_list = filtered_destinations
-                    else:
-                        dest = filtered_destinations[0]
-                        destination_list = filtered_destinations
+                    dest = first_city_country if first_city_country is not None else filtered_destinations[0]
+                    destination_list = filtered_destinations
                 else:
                     # Fallback to first destination if all were filtered
                     dest = destinations[0]
@@ -136,19 +361,15 @@ class VacationPlanner:
             else:
                 dest = destinations
                 destination_list = [dest]
-            dest = dest.strip() if isinstance(dest, str) else str(dest)
-
-            missing_info = []
-            if not preferences.get("budget_range"):
-                missing_info.append("Budget range")
-            if not preferences.get("travel_dates"):
-                missing_info.append("Travel dates")
-            if not preferences.get("travel_style"):
-                missing_info.append("Travel style")
-            if not preferences.get("group_size"):
-                missing_info.append("Group size")
+            dest = _clean_destination(dest)
 
-            completeness = self._calculate_completeness_percentage(preferences)
+            # Destinations are already known here, so only the other essentials
+            # can be missing; count what we have while we look
+            filled = _filled_mask(preferences, self._SUMMARY_FIELD_NAMES)
+            missing_info = [
+                label for bit, (_, label) in enumerate(self._SUMMARY_FIELDS) if not filled >> bit & 1
+            ]
+            completeness = _completeness_pct(1 + filled.bit_count(), len(self._ESSENTIAL_FIELDS))
 
             summary = {
                 "destination": dest,
@@ -157,23 +378,14 @@ class VacationPlanner:
                 "completeness_percentage": completeness,
                 "missing_info": missing_info,
                 "recommendations": self._generate_recommendations(preferences),
-                "created_at": datetime.now().isoformat()
+                "status": _STATUS_TABLE[completeness],
+                "created_at": now_iso or datetime.now().isoformat()
             }
-            if preferences.get("budget_amount"):
-                summary["budget_amount"] = preferences.get("budget_amount")
-
-            for field in ["travel_dates", "travel_style", "group_size", "interests"]:
-                if preferences.get(field):
-                    summary[field] = preferences[field]
-
-            if completeness >= 80:
-                summary["status"] = "Great! You're almost ready to go!"
-            elif completeness >= 60:
-                summary["status"] = "Good progress! Just a few more details to nail down."
-            elif completeness >= 40:
-                summary["status"] = "Getting there! You've got the basics covered."
-            else:
-                summary["status"] = "Just getting started! Let's fill in some more details."
+
+            for field in self._SUMMARY_OPTIONAL_FIELDS:
+                value = preferences.get(field)
+                if value:
+                    summary[field] = value
 
             return summary
         except Exception as e:
@@ -184,177 +396,84 @@ class VacationPlanner:
         if not preferences:
             return 0
 
-        essential_fields = [
-            "destinations", "travel_dates", "budget_range",
-            "travel_style", "group_size"
-        ]
-        completed = sum(1 for field in essential_fields if preferences.get(field))
-        percentage = (completed / len(essential_fields)) * 100
-        return int(percentage)
+        filled = _filled_mask(preferences, self._ESSENTIAL_FIELDS)
+        return _completeness_pct(filled.bit_count(), len(self._ESSENTIAL_FIELDS))
 
     def _generate_recommendations(self, preferences: Dict) -> List[str]:
-        destinations = preferences.get("destinations") or ["your destination"]
-        dest = destinations[0] if isinstance(destinations, list) else destinations
-        dest = dest.strip() if isinstance(dest, str) else str(dest)
+        # One recommendation each for budget, travel style and dates.
+        dest = _primary_destination(preferences.get("destinations") or ["your destination"])
 
-        travel_style = preferences.get("travel_style") or []
-        budget = preferences.get("budget_range", "moderate")
+        get = preferences.get
+        travel_style = get("travel_style") or []
+        budget = get("budget_range", "moderate")
 
-        recommendations: List[str] = []
+        budget_template = _BUDGET_RECOMMENDATIONS.get(budget) if isinstance(budget, str) else None
+        if budget_template is None:
+            budget_template = _DEFAULT_BUDGET_RECOMMENDATION
 
-        if budget == "budget":
-            recommendations.append(
-                f"For your budget-friendly trip to {dest}, look for free walking tours, street food, and local markets."
-            )
-        elif budget == "luxury":
-            recommendations.append(
-                f"For your luxury trip to {dest}, consider private guides, fine dining, and exclusive experiences."
+        styles = ""
+        if travel_style:
+            style_set = frozenset(style.casefold() for style in travel_style if isinstance(style, str))
+            style_template = next(
+                (template for style, template in _STYLE_RECOMMENDATIONS if style in style_set),
+                None
             )
+            if style_template is None:
+                # Only this template lists the styles, so only join them here
+                style_template = _INTERESTS_RECOMMENDATION
+                styles = ", ".join(travel_style)
         else:
-            recommendations.append(
-                f"For your {budget} trip to {dest}, mix famous attractions with local experiences and food tours."
-            )
+            style_template = _NO_STYLE_RECOMMENDATION
 
-        if travel_style:
-            style_lower = [style.lower() for style in travel_style if isinstance(style, str)]
-            if "adventure" in style_lower:
-                recommendations.append(f"Since you love adventure, plan hikes and outdoor activities in {dest}.")
-            elif "relaxation" in style_lower:
-                recommendations.append(f"Since relaxation matters, add spa time and scenic strolls in {dest}.")
-            elif "food" in style_lower or "foodie" in style_lower:
-                recommendations.append(f"As a food lover, try markets, street food, and cooking classes in {dest}.")
-            else:
-                style_text = ", ".join(travel_style)
-                recommendations.append(f"Plan your days in {dest} around your interests: {style_text}.")
-        else:
-            recommendations.append(f"Plan your days in {dest} around local cuisine, cultural sites, and hidden gems.")
+        dates_template = _DATES_SET_RECOMMENDATION if get("travel_dates") else _NO_DATES_RECOMMENDATION
 
-        if preferences.get("travel_dates"):
-            recommendations.append(f"Since your dates are set, check the forecast for {dest} and pack accordingly.")
-        else:
-            recommendations.append(f"Don't forget to research the best time to visit {dest} before choosing dates.")
-
-        group_size = preferences.get("group_size")
-        if group_size:
-            if group_size == 1:
-                recommendations.append(f"As a solo traveler in {dest}, consider group tours or hostels to meet people.")
-            elif group_size >= 4:
-                recommendations.append(f"With a group of {group_size}, book larger stays and plan shared activities in {dest}.")
-            else:
-                recommendations.append(f"With {group_size} travelers, keep plans flexible so everyone enjoys {dest}.")
+        return [
+            budget_template.format(dest=dest, budget=budget),
+            style_template.format(dest=dest, styles=styles),
+            dates_template.format(dest=dest)
+        ]
 
-        return [rec for rec in recommendations if len(rec) > 10][:3]
+    def _build_plan_sections(self, destination: str, preferences: Dict) -> Dict:
+        # Everything in a plan that depends only on the destination and budget,
+        # built in one go. The _generate_* helpers below return the same
+        # sections one at a time.
+        tier = _budget_tier(preferences.get("budget_range"))
+        return {
+            "estimated_budget": dict(_BUDGET_ESTIMATES[tier]),
+            "suggested_activities": list(_destination_activities(destination)),
+            "accommodation_recommendations": _typed_options(_accommodation_options(destination, tier)),
+            "transportation_options": _typed_options(_transportation_options(destination)),
+            "best_time_to_visit": _BEST_TIME_TEMPLATE.format(dest=destination),
+            "weather_info": dict(_weather_info(destination)),
+            "local_tips": list(_local_tips(destination))
+        }
 
     def _generate_destination_activities(self, destination: str, preferences: Dict) -> List[str]:
-        activities: List[str]
-        dest_lower = destination.lower()
-
-        if "paris" in dest_lower:
-            activities = [
-                f"Visit the Eiffel Tower in {destination}",
-                f"Explore the Louvre Museum in {destination}",
-                f"Walk along the Champs-Élysées in {destination}",
-                f"Take a Seine River cruise in {destination}",
-                f"Visit Notre-Dame Cathedral in {destination}"
-            ]
-        elif "tokyo" in dest_lower:
-            activities = [
-                f"Visit Senso-ji Temple in {destination}",
-                f"Explore Shibuya Crossing in {destination}",
-                f"Visit the Tokyo Skytree in {destination}",
-                f"Walk through Meiji Shrine in {destination}",
-                f"Experience Tsukiji Fish Market in {destination}"
-            ]
-        elif "bali" in dest_lower:
-            activities = [
-                f"Visit Tanah Lot Temple in {destination}",
-                f"Explore Ubud Monkey Forest in {destination}",
-                f"Relax at Nusa Dua Beach in {destination}",
-                f"Take a rice terrace tour in {destination}",
-                f"Experience traditional Balinese dance in {destination}"
-            ]
-        else:
-            activities = [
-                f"Explore the main attractions in {destination}",
-                f"Visit local museums and cultural sites in {destination}",
-                f"Try local cuisine in {destination}",
-                f"Take a guided tour of {destination}",
-                f"Experience local markets in {destination}"
-            ]
-
-        return activities[:5]
+        return list(_destination_activities(destination))
 
     def _generate_accommodation_recommendations(self, destination: str, preferences: Dict) -> List[Dict]:
-        budget_range = preferences.get("budget_range", "moderate")
-        if budget_range == "budget":
-            return [
-                {"type": "Hostel", "description": f"Budget-friendly hostels in {destination}"},
-                {"type": "Guesthouse", "description": f"Local guesthouses in {destination}"},
-                {"type": "Budget Hotel", "description": f"Affordable hotels in {destination}"}
-            ]
-        if budget_range == "luxury":
-            return [
-                {"type": "Luxury Hotel", "description": f"5-star hotels in {destination}"},
-                {"type": "Resort", "description": f"Exclusive resorts in {destination}"},
-                {"type": "Boutique Hotel", "description": f"Luxury boutique hotels in {destination}"}
-            ]
-        return [
-            {"type": "Hotel", "description": f"Comfortable hotels in {destination}"},
-            {"type": "Apartment", "description": f"Vacation rentals in {destination}"},
-            {"type": "B&B", "description": f"Bed and breakfasts in {destination}"}
-        ]
+        return _typed_options(_accommodation_options(destination, _budget_tier(preferences.get("budget_range"))))
 
     def _generate_transportation_options(self, destination: str, preferences: Dict) -> List[Dict]:
-        return [
-            {"type": "Public Transit", "description": f"Metro, buses, and trains in {destination}"},
-            {"type": "Walking", "description": f"Explore {destination} on foot"},
-            {"type": "Bicycle", "description": f"Rent a bike to explore {destination}"},
-            {"type": "Taxi/Rideshare", "description": f"Convenient transportation in {destination}"}
-        ]
+        return _typed_options(_transportation_options(destination))
 
     def _generate_local_tips(self, destination: str, preferences: Dict) -> List[str]:
-        return [
-            f"Learn a few basic phrases in the local language of {destination}.",
-            f"Research local customs and etiquette in {destination}.",
-            f"Check the weather forecast for {destination} before packing.",
-            f"Download offline maps for {destination} and mark key spots.",
-            f"Keep emergency contact numbers handy while traveling in {destination}."
-        ]
+        return list(_local_tips(destination))
 
     def _generate_weather_info(self, destination: str, preferences: Dict) -> Dict:
-        return {
-            "current": f"Check local weather forecast for {destination} before departure.",
-            "best_months": f"Research the best time to visit {destination} for ideal weather.",
-            "packing_tips": "Pack layers and comfortable shoes to adapt to activities."
-        }
+        return dict(_weather_info(destination))
 
     def _generate_best_time_to_visit(self, destination: str, preferences: Dict) -> str:
-        return f"Research the best time to visit {destination} based on weather and local events."
+        return _BEST_TIME_TEMPLATE.format(dest=destination)
 
     def _generate_budget_estimate(self, preferences: Dict) -> Dict[str, float]:
-        budget_range = preferences.get("budget_range", "moderate")
-        if budget_range == "budget":
-            return {"min": 50, "max": 150, "currency": "USD"}
-        if budget_range == "luxury":
-            return {"min": 300, "max": 1000, "currency": "USD"}
-        return {"min": 150, "max": 300, "currency": "USD"}
+        return dict(_BUDGET_ESTIMATES[_budget_tier(preferences.get("budget_range"))])
 
     def _generate_itinerary(self, destination: str, duration_days: int, preferences: Dict) -> List[Dict]:
-        itinerary: List[Dict] = []
         max_days = min(max(duration_days, 1), 7)
-
-        for day in range(1, max_days + 1):
-            day_plan = {
-                "day": day,
-                "activities": [
-                    f"Explore {destination}",
-                    f"Visit local attractions in {destination}",
-                    f"Enjoy local cuisine in {destination}"
-                ]
-            }
-            itinerary.append(day_plan)
-
-        return itinerary
+        # Every day gets the same suggestions; each day still gets its own list
+        activities = _itinerary_activities(destination)
+        return [{"day": day, "activities": list(activities)} for day in range(1, max_days + 1)]
 
     def get_planner_stats(self) -> Dict[str, int]:
         return {
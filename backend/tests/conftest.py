@@ -5,12 +5,15 @@ from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from bson import ObjectId
 from datetime import datetime
+from types import SimpleNamespace
 
 # Set environment variable to skip MongoDB connection during tests
 os.environ["SKIP_MONGODB_CONNECTION"] = "true"
+# Hash passwords with the cheapest bcrypt cost; the default 12 rounds
+# makes every signup in the suite CPU-bound
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
-# Mock the database before importing the app
-with patch('app.database.get_database') as mock_get_db:
+def _build_mock_db():
     # Create a mock database with collections
     mock_db = MagicMock()
     mock_db.users = AsyncMock()
@@ -19,16 +22,68 @@ with patch('app.database.get_database') as mock_get_db:
     
     # Mock database methods
     mock_db.users.find_one.return_value = None
-    mock_db.users.insert_one.return_value = MagicMock(inserted_id=ObjectId())
+    mock_db.users.insert_one.return_value = SimpleNamespace(inserted_id=ObjectId())
     mock_db.conversations.find_one.return_value = None
-    mock_db.conversations.insert_one.return_value = MagicMock(inserted_id=ObjectId())
+    mock_db.conversations.insert_one.return_value = SimpleNamespace(inserted_id=ObjectId())
+    return mock_db
+
+
+def _build_mock_container():
+    # Create mock services
+    mock_container = MagicMock()
+    mock_container.user_service = AsyncMock()
+    mock_container.conversation_service = AsyncMock()
+    mock_container.openai_service = AsyncMock()
     
-    mock_get_db.return_value = mock_db
+    # Mock user service methods
+    mock_container.user_service.get_user_by_email.return_value = None
+    mock_container.user_service.create_user.return_value = MagicMock(
+        id=ObjectId(),
+        email="test@example.com",
+        full_name="Test User",
+        is_active=True
+    )
+    mock_container.user_service.authenticate_user.return_value = MagicMock(
+        id=ObjectId(),
+        email="test@example.com",
+        full_name="Test User",
+        is_active=True
+    )
     
+    # Mock conversation service methods
+    mock_container.conversation_service.create_conversation.return_value = MagicMock(
+        id=ObjectId(),
+        title="Test Conversation",
+        user_id="user123",
+        messages=[],
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    return mock_container
+
+
+# Mock the database before importing the app
+with patch('app.database.get_database', return_value=_build_mock_db()):
     # Create a simple test app
     from app.main import app as test_app
 
 
+# Tests that use any of these fixtures run real services against a
+# database; they get the "integration" marker so a quick local run can
+# deselect them with -m "not integration"
+_DATABASE_FIXTURES = frozenset(("test_database", "real_container", "real_container_with_mocked_openai"))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "integration: runs real services against a test database")
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        if _DATABASE_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.integration)
+
+
 # Mock database connection for unit tests
 @pytest.fixture(autouse=True)
 def mock_database(request):
@@ -40,20 +95,7 @@ def mock_database(request):
         return
     
     # Mock database connection for unit tests
-    with patch('app.database.get_database') as mock_get_db:
-        # Create a mock database with collections
-        mock_db = MagicMock()
-        mock_db.users = AsyncMock()
-        mock_db.conversations = AsyncMock()
-        mock_db.messages = AsyncMock()
-        
-        # Mock database methods
-        mock_db.users.find_one.return_value = None
-        mock_db.users.insert_one.return_value = MagicMock(inserted_id=ObjectId())
-        mock_db.conversations.find_one.return_value = None
-        mock_db.conversations.insert_one.return_value = MagicMock(inserted_id=ObjectId())
-        
-        mock_get_db.return_value = mock_db
+    with patch('app.database.get_database', return_value=_build_mock_db()) as mock_get_db:
         yield mock_get_db
 
 
@@ -69,39 +111,9 @@ def mock_service_container(request):
         return
     
     # Mock service container for unit tests
-    with patch('app.core.container.get_container') as mock_get_container:
-        # Create mock services
-        mock_container = MagicMock()
-        mock_container.user_service = AsyncMock()
-        mock_container.conversation_service = AsyncMock()
-        mock_container.openai_service = AsyncMock()
-        
-        # Mock user service methods
-        mock_container.user_service.get_user_by_email.return_value = None
-        mock_container.user_service.create_user.return_value = MagicMock(
-            id=ObjectId(),
-            email="test@example.com",
-            full_name="Test User",
-            is_active=True
-        )
-        mock_container.user_service.authenticate_user.return_value = MagicMock(
-            id=ObjectId(),
-            email="test@example.com",
-            full_name="Test User",
-            is_active=True
-        )
-        
-        # Mock conversation service methods
-        mock_container.conversation_service.create_conversation.return_value = MagicMock(
-            id=ObjectId(),
-            title="Test Conversation",
-            user_id="user123",
-            messages=[],
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        
-        mock_get_container.return_value = mock_container
+    # A fresh mock per test, so return values and side effects set by one
+    # test never leak into the next
+    with patch('app.core.container.get_container', return_value=_build_mock_container()) as mock_get_container:
         yield mock_get_container
 
 
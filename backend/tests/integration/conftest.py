@@ -0,0 +1,34 @@
+# Fixtures shared by the API integration test modules
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.models.user import TokenData
+
+_FIXED_USER_ID = "507f1f77bcf86cd799439011"
+
+
+@pytest.fixture(scope="module")
+def client():
+# Create one test client per module; the modules reset dependency
+# overrides around every test and the app sets no cookies.
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_client():
+# Create async test client. Integration tests run on the session event
+# loop, the loop the shared Motor client is bound to.
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True) as ac:
+        yield ac
+
+
+@pytest.fixture
+def mock_user():
+# Create a mock user for authentication.
+    return TokenData(
+        user_id=_FIXED_USER_ID,
+        email="test@example.com"
+    )
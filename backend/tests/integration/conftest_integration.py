@@ -1,7 +1,9 @@
 # Integration test fixtures that use real services with a test database.
 import pytest
+import pytest_asyncio
 import os
-import asyncio
+import uuid
+from contextlib import contextmanager
 from motor.motor_asyncio import AsyncIOMotorClient
 from unittest.mock import patch, MagicMock, AsyncMock
 
@@ -9,93 +11,123 @@ from app.core.container import ServiceContainer
 from app.database.database import get_database
 
 
-@pytest.fixture(scope="function")
-def test_database():
-    # Create a real test database connection using mongomock or real MongoDB
-    # Try to use real MongoDB first
+def async_override(value):
+    # Build a coroutine dependency override returning value. FastAPI runs
+    # sync overrides such as lambda: value in its threadpool, so every
+    # request would pay a thread handoff.
+    async def _override():
+        return value
+    return _override
+
+
+@contextmanager
+def override_dependencies(app, overrides):
+    # Install dependency overrides for the duration of a test and then put
+    # back exactly what was there before, including anything the test
+    # itself added or replaced
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides.update(overrides)
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+
+
+def _build_mock_database():
+    # Final fallback: use mock database (not ideal for integration tests)
+    from types import SimpleNamespace
+    mock_db = MagicMock()
+    mock_db.users = MagicMock()
+    mock_db.conversations = MagicMock()
+    # Ensure update_one returns proper result with integer modified_count
+    mock_result = SimpleNamespace()
+    mock_result.modified_count = 1  # Ensure it's an int, not a MagicMock
+    mock_result.matched_count = 1
+    mock_result.upserted_id = None
+    mock_db.conversations.update_one = AsyncMock(return_value=mock_result)
+    return mock_db
+
+
+def _build_mock_openai_client():
+    # Create mock OpenAI client responses
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_choice = MagicMock()
+    mock_message = MagicMock()
+    mock_message.content = "Test AI response"
+    mock_message.function_call = None
+    mock_choice.message = mock_message
+    mock_response.choices = [mock_choice]
+    mock_client.chat.completions.create = MagicMock(return_value=mock_response)
+    return mock_client
+
+
+def _build_real_container():
+    # Create a real ServiceContainer with real services. Call this while
+    # get_database is patched to return the test database.
+    container = ServiceContainer()
+    # Reset container to force re-initialization
+    container.reset()
+    
+    # Access services to trigger initialization with test database
+    _ = container.user_service  # Triggers initialization
+    _ = container.conversation_service  # Triggers initialization
+    _ = container.openai_service  # Real service (we'll mock OpenAI API calls)
+    _ = container.error_recovery  # Real service
+    _ = container.vacation_planner  # Real service
+    _ = container.proactive_assistant  # Real service
+    _ = container.intelligence_service  # Real service
+    _ = container.memory  # Real service
+    _ = container.conversation_handler  # Real conversation orchestration
+    return container
+
+
+@pytest.fixture(scope="session")
+def _mongo_client():
+    # One client (and connection pool) shared by every integration test;
+    # tests are isolated by database name instead of by client. Motor keeps
+    # the event loop it first runs on, so every integration test and async
+    # fixture runs on the session-scoped loop (loop_scope="session").
     try:
         from app.config import settings
         mongodb_url = os.getenv("TEST_MONGODB_URL", settings.mongodb_url)
-        
-        # Use async Motor client
-        from motor.motor_asyncio import AsyncIOMotorClient
         client = AsyncIOMotorClient(mongodb_url)
-        test_db_name = f"test_vacation_planner_{os.getpid()}_{id(client)}"
-        db = client[test_db_name]
-        
-        yield db
-        
-        # Cleanup: drop test database after test
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running, schedule cleanup
-                asyncio.create_task(client.drop_database(test_db_name))
-            else:
-                loop.run_until_complete(client.drop_database(test_db_name))
-            client.close()
-        except Exception as e:
-            # Ignore cleanup errors
-            pass
     except Exception:
         # Fallback: try mongomock if real MongoDB not available
         try:
             from mongomock_motor import AsyncMongoMockClient
-            
             client = AsyncMongoMockClient()
-            test_db_name = f"test_vacation_planner_{os.getpid()}"
-            db = client[test_db_name]
-            
-            yield db
-            # Cleanup
-            try:
-                import asyncio
-                loop = asyncio.get_event_loop()
-                drop_task = client.drop_database(test_db_name)
-                if loop.is_running():
-                    loop.create_task(drop_task)
-                else:
-                    loop.run_until_complete(drop_task)
-                client.close()
-            except Exception:
-                pass
         except (ImportError, AttributeError):
-            # Final fallback: use mock database (not ideal for integration tests)
-            from types import SimpleNamespace
-            mock_db = MagicMock()
-            mock_db.users = MagicMock()
-            mock_db.conversations = MagicMock()
-            # Ensure update_one returns proper result with integer modified_count
-            mock_result = SimpleNamespace()
-            mock_result.modified_count = 1  # Ensure it's an int, not a MagicMock
-            mock_result.matched_count = 1
-            mock_result.upserted_id = None
-            mock_db.conversations.update_one = AsyncMock(return_value=mock_result)
-            yield mock_db
+            client = None
+    
+    yield client
+    
+    if client is not None:
+        client.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_database(_mongo_client):
+    # Give each test its own database on the shared client
+    if _mongo_client is not None:
+        test_db_name = f"test_vacation_planner_{uuid.uuid4().hex}"
+        db = _mongo_client[test_db_name]
+        
+        yield db
+        
+        # Cleanup: drop test database after test
+        await _mongo_client.drop_database(test_db_name)
+    else:
+        yield _build_mock_database()
 
 
 @pytest.fixture(scope="function")
 def real_container(test_database):
-    # Create a real ServiceContainer with real services using test database
-    container = ServiceContainer()
-    
     # Patch both database access points to return our test database
     with patch('app.database.get_database', return_value=test_database), \
          patch('app.core.container.get_database', return_value=test_database):
-        # Reset container to force re-initialization
-        container.reset()
-        
-        # Access services to trigger initialization with test database
-        _ = container.user_service  # Triggers initialization
-        _ = container.conversation_service  # Triggers initialization
-        _ = container.openai_service  # Real service (we'll mock OpenAI API calls)
-        _ = container.error_recovery  # Real service
-        _ = container.vacation_planner  # Real service
-        _ = container.proactive_assistant  # Real service
-        _ = container.intelligence_service  # Real service
-        _ = container.memory  # Real service
-        _ = container.conversation_handler  # Real conversation orchestration
+        container = _build_real_container()
         
         yield container
         
@@ -103,28 +135,45 @@ def real_container(test_database):
         container.reset()
 
 
-@pytest.fixture(scope="function")
-def real_container_with_mocked_openai(real_container):
-    # Real container with OpenAI API calls mocked to avoid API costs
-    # Mock only the OpenAI client, not the entire service
-    original_client = real_container.openai_service.client
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def _shared_real_container(_mongo_client):
+    # One real container per test module, on its own database. Building the
+    # services is the expensive part; tests only need the data cleared.
+    # Yields the database to reset, or None for the mock fallback.
+    if _mongo_client is not None:
+        test_db_name = f"test_vacation_planner_{uuid.uuid4().hex}"
+        database = _mongo_client[test_db_name]
+    else:
+        test_db_name = None
+        database = _build_mock_database()
     
-    # Create mock OpenAI client responses
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_choice = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Test AI response"
-    mock_message.function_call = None
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_client.chat.completions.create = MagicMock(return_value=mock_response)
+    with patch('app.database.get_database', return_value=database), \
+         patch('app.core.container.get_database', return_value=database):
+        container = _build_real_container()
+        
+        yield container, (database if test_db_name is not None else None)
+        
+        container.reset()
     
-    # Replace the client
-    real_container.openai_service.client = mock_client
+    if test_db_name is not None:
+        await _mongo_client.drop_database(test_db_name)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def real_container_with_mocked_openai(_shared_real_container):
+    # Real container with OpenAI API calls mocked to avoid API costs.
+    # The container is shared across the module, so start each test with
+    # empty collections and a fresh mock OpenAI client.
+    container, database = _shared_real_container
+    if database is not None:
+        await database.users.delete_many({})
+        await database.conversations.delete_many({})
     
-    yield real_container
+    # Mock only the OpenAI client, not the entire service
+    original_client = container.openai_service.client
+    container.openai_service.client = _build_mock_openai_client()
+    
+    yield container
     
     # Restore original client
-    real_container.openai_service.client = original_client
-
+    container.openai_service.client = original_client
@@ -1,17 +1,23 @@
+import asyncio
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime
-from bson import ObjectId
-from fastapi.testclient import TestClient
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from app.main import app
-from app.models.conversation_db import ConversationInDB, ConversationSummary
+from app.models.conversation_db import ConversationSummary
 from app.auth.dependencies import get_current_user
 from app.core.container import get_container
+from tests.integration.conftest_integration import async_override, override_dependencies
 
 # Use real services for integration tests
 pytest_plugins = ['tests.integration.conftest_integration']
 
-pytestmark = pytest.mark.asyncio
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# Fixed id and timestamp, built once at import
+_MISSING_CONVERSATION_ID = "507f191e810c19729de860ea"
+_NOW = datetime.now(timezone.utc)
 
 
 class TestAPISoftDeleteIntegration:
@@ -20,18 +26,17 @@ class TestAPISoftDeleteIntegration:
     def setup_and_teardown(self, mock_user, real_container_with_mocked_openai):
         # Set up and tear down dependency overrides for each test
         # Use real services instead of mocks
-        app.dependency_overrides[get_current_user] = lambda: mock_user
-        app.dependency_overrides[get_container] = lambda: real_container_with_mocked_openai
-        yield
-        # Clean up dependency overrides after each test
-        app.dependency_overrides.clear()
+        with override_dependencies(app, {
+            get_current_user: async_override(mock_user),
+            get_container: async_override(real_container_with_mocked_openai)
+        }):
+            yield
     
     # Override mock_user to use real user from database
-    @pytest.fixture
-    def real_user(self, real_container_with_mocked_openai):
+    @pytest_asyncio.fixture(loop_scope="session")
+    async def real_user(self, real_container_with_mocked_openai):
         # Create a real user in the test database
         from app.models.user import UserCreate
-        import asyncio
         
         user_data = UserCreate(
             email="test@example.com",
@@ -39,7 +44,7 @@ class TestAPISoftDeleteIntegration:
             password="SecurePass123!"
         )
         
-        user = asyncio.run(real_container_with_mocked_openai.user_service.create_user(user_data))
+        user = await real_container_with_mocked_openai.user_service.create_user(user_data)
         
         from app.models.user import TokenData
         return TokenData(
@@ -47,46 +52,17 @@ class TestAPISoftDeleteIntegration:
             email=user.email
         )
     
-    @pytest.fixture
-    def client(self):
-    # Create test client.
-        return TestClient(app)
-    
-    @pytest.fixture
-    def mock_user(self):
-    # Create a mock user.
-        from app.models.user import TokenData
-        return TokenData(
-            user_id=str(ObjectId()),
-            email="test@example.com"
-        )
-    
-    @pytest.fixture
-    def mock_conversation(self):
-    # Create a mock conversation.
-        return ConversationInDB(
-            id=ObjectId(),
-            user_id="user123",
-            title="Test Conversation",
-            messages=[],
-            vacation_preferences={},
-            is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-    
     @pytest.fixture
     def mock_conversation_service(self):
         # Provide a basic mock service for API endpoint tests that expect mocked services
         service = MagicMock()
         service.delete_conversation = AsyncMock(return_value=True)
-        from datetime import datetime, timezone
         service.get_user_conversations = AsyncMock(return_value=[
             {
                 "id": "conv_active",
                 "title": "Active Conversation",
-                "created_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc),
+                "created_at": _NOW,
+                "updated_at": _NOW,
                 "message_count": 0
             }
         ])
@@ -95,30 +71,43 @@ class TestAPISoftDeleteIntegration:
     @pytest.fixture
     def mock_container(self, mock_conversation_service):
     # Create a mock service container.
-        container = MagicMock()
-        container.conversation_service = mock_conversation_service
-        return container
+        # The conversation endpoints only read conversation_service
+        return SimpleNamespace(conversation_service=mock_conversation_service)
     
-    async def test_delete_conversation_endpoint_soft_delete(
+    @pytest.mark.parametrize("conversation_id, configure_delete, expected_status, expected_text", [
+        ("507f1f77bcf86cd799439011", lambda delete: setattr(delete, "return_value", True),
+         200, "Conversation deleted successfully"),
+        # Conversation owned by a different user
+        ("other_user_conv", lambda delete: setattr(delete, "return_value", False),
+         404, "We couldn't find that conversation"),
+        ("conv1", lambda delete: setattr(delete, "side_effect", Exception("Database error")),
+         500, "Sorry, we couldn't delete that conversation")
+    ], ids=["soft_delete", "unauthorized", "service_error"])
+    async def test_delete_conversation_endpoint(
         self, 
         client, 
         mock_user, 
-        mock_container
+        mock_container,
+        conversation_id,
+        configure_delete,
+        expected_status,
+        expected_text
     ):
-        valid_conv_id = "507f1f77bcf86cd799439011"
+        delete_conversation = mock_container.conversation_service.delete_conversation
+        configure_delete(delete_conversation)
         
         # Make DELETE request
-        app.dependency_overrides[get_container] = lambda: mock_container
-        response = client.delete(f"/api/v1/conversations/{valid_conv_id}")
+        app.dependency_overrides[get_container] = async_override(mock_container)
+        response = client.delete(f"/api/v1/conversations/{conversation_id}")
         
         # Verify response
-        assert response.status_code == 200
-        assert response.json()["message"] == "Conversation deleted successfully"
+        assert response.status_code == expected_status
+        assert expected_text.encode() in response.content
         
         # Verify service method was called
-        call_args = mock_container.conversation_service.delete_conversation.call_args
+        call_args = delete_conversation.call_args
         assert call_args is not None
-        assert call_args[1]["conversation_id"] == valid_conv_id
+        assert call_args[1]["conversation_id"] == conversation_id
         assert call_args[1]["user_id"] == str(mock_user.user_id)
     
     async def test_get_conversations_filters_active_only(
@@ -128,7 +117,7 @@ class TestAPISoftDeleteIntegration:
         mock_container
     ):
         # Make GET request
-        app.dependency_overrides[get_container] = lambda: mock_container
+        app.dependency_overrides[get_container] = async_override(mock_container)
         response = client.get("/api/v1/conversations/")
         
         # Verify response
@@ -145,28 +134,26 @@ class TestAPISoftDeleteIntegration:
     
     async def test_delete_conversation_not_found(
         self, 
-        client, 
+        async_client, 
         real_user, 
         real_container_with_mocked_openai
     ):
-        fake_id = str(ObjectId())
-        
         # Make DELETE request
-        response = client.delete(f"/api/v1/conversations/{fake_id}")
+        response = await async_client.delete(f"/api/v1/conversations/{_MISSING_CONVERSATION_ID}")
         
         # Verify response
         assert response.status_code == 404
         # Our new human-like error message
-        assert "We couldn't find that conversation" in response.json()["detail"]
+        assert b"We couldn't find that conversation" in response.content
     
     async def test_get_conversation_after_soft_delete(
         self, 
-        client, 
+        async_client, 
         real_user, 
         real_container_with_mocked_openai
     ):
         # Create a conversation
-        create_response = client.post(
+        create_response = await async_client.post(
             "/api/v1/conversations",
             params={"title": "To Soft Delete"},
             headers={"Authorization": f"Bearer fake_token"}
@@ -175,23 +162,23 @@ class TestAPISoftDeleteIntegration:
         conversation_id = create_response.json()["id"]
         
         # Delete it (soft delete)
-        delete_response = client.delete(f"/api/v1/conversations/{conversation_id}")
+        delete_response = await async_client.delete(f"/api/v1/conversations/{conversation_id}")
         assert delete_response.status_code == 200
         
         # Try to get it - should return 404 because soft-deleted conversations are filtered
-        response = client.get(f"/api/v1/conversations/{conversation_id}")
+        response = await async_client.get(f"/api/v1/conversations/{conversation_id}")
         
         # The API filters out soft-deleted conversations, so it returns 404
         assert response.status_code == 404
     
     async def test_create_conversation_sets_active_true(
         self, 
-        client, 
+        async_client, 
         real_user, 
         real_container_with_mocked_openai
     ):
         # Make POST request
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/conversations/",
             params={"title": "New Test Conversation"}
         )
@@ -204,22 +191,23 @@ class TestAPISoftDeleteIntegration:
     
     async def test_update_conversation_preserves_active_status(
         self, 
-        client, 
+        async_client, 
         real_user, 
         real_container_with_mocked_openai
     ):
         # First create a conversation
-        create_response = client.post(
+        create_response = await async_client.post(
             "/api/v1/conversations",
             params={"title": "Original Title"},
             headers={"Authorization": f"Bearer fake_token"}
         )
         assert create_response.status_code == 201
-        conversation_id = create_response.json()["id"]
-        assert create_response.json()["is_active"] is True
+        created = create_response.json()
+        conversation_id = created["id"]
+        assert created["is_active"] is True
         
         # Update it
-        response = client.put(
+        response = await async_client.put(
             f"/api/v1/conversations/{conversation_id}",
             json={"title": "Updated Conversation"}
         )
@@ -232,32 +220,34 @@ class TestAPISoftDeleteIntegration:
     
     async def test_conversation_list_excludes_inactive(
         self, 
-        client, 
+        async_client, 
         real_user, 
         real_container_with_mocked_openai
     ):
-        # Create two active conversations
-        create1 = client.post(
-            "/api/v1/conversations",
-            params={"title": "Active Conversation 1"},
-            headers={"Authorization": f"Bearer fake_token"}
+        # Create two active conversations; the creates are independent, so
+        # issue them together
+        create1, create2 = await asyncio.gather(
+            async_client.post(
+                "/api/v1/conversations/",
+                params={"title": "Active Conversation 1"},
+                headers={"Authorization": f"Bearer fake_token"}
+            ),
+            async_client.post(
+                "/api/v1/conversations/",
+                params={"title": "Active Conversation 2"},
+                headers={"Authorization": f"Bearer fake_token"}
+            )
         )
         assert create1.status_code == 201
-        
-        create2 = client.post(
-            "/api/v1/conversations",
-            params={"title": "Active Conversation 2"},
-            headers={"Authorization": f"Bearer fake_token"}
-        )
         assert create2.status_code == 201
         
         # Delete one (soft delete) - remove the second conversation
         conv2_id = create2.json()["id"]
-        delete_response = client.delete(f"/api/v1/conversations/{conv2_id}")
+        delete_response = await async_client.delete(f"/api/v1/conversations/{conv2_id}")
         assert delete_response.status_code == 200
         
         # Get conversations - should only return active ones
-        response = client.get("/api/v1/conversations/")
+        response = await async_client.get("/api/v1/conversations/")
         
         # Verify response
         assert response.status_code == 200
@@ -265,37 +255,3 @@ class TestAPISoftDeleteIntegration:
         # Should have at least 1 active conversation (the one we didn't delete)
         assert len(conversations) == 1
         assert conversations[0]["title"] == "Active Conversation 1"
-    
-    async def test_unauthorized_delete_conversation(
-        self, 
-        client, 
-        mock_user, 
-        mock_container
-    ):
-        mock_container.conversation_service.delete_conversation.return_value = False
-        
-        # Make DELETE request for conversation owned by different user
-        app.dependency_overrides[get_container] = lambda: mock_container
-        response = client.delete("/api/v1/conversations/other_user_conv")
-        
-        # Verify response
-        assert response.status_code == 404
-        # Our new human-like error message
-        assert "We couldn't find that conversation" in response.json()["detail"]
-    
-    async def test_delete_conversation_service_error(
-        self, 
-        client, 
-        mock_user, 
-        mock_container
-    ):
-        mock_container.conversation_service.delete_conversation.side_effect = Exception("Database error")
-        
-        # Make DELETE request
-        app.dependency_overrides[get_container] = lambda: mock_container
-        response = client.delete("/api/v1/conversations/conv1")
-        
-        # Verify response
-        assert response.status_code == 500
-        # Our new human-like error message
-        assert "Sorry, we couldn't delete that conversation" in response.json()["detail"] 
\ No newline at end of file
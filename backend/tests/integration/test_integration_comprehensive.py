@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime
 from bson import ObjectId
-import asyncio
 from app.services.conversation_service import ConversationService
 from app.services.user_service import UserService
 from app.services.openai_service import OpenAIService
@@ -12,18 +11,28 @@ from app.models.chat import Message, MessageRole
 
 pytest_plugins = ['tests.integration.conftest_integration']
 
+_TIMESTAMP = datetime.utcnow().isoformat()
+
+# The services come from the module-wide real container, so each test
+# only asks for the ones it uses
+@pytest.fixture
+def user_service(real_container_with_mocked_openai):
+    return real_container_with_mocked_openai.user_service
+
+@pytest.fixture
+def conversation_service(real_container_with_mocked_openai):
+    return real_container_with_mocked_openai.conversation_service
+
 @pytest.fixture
-def services(real_container_with_mocked_openai):
-    return {
-        'user_service': real_container_with_mocked_openai.user_service,
-        'conversation_service': real_container_with_mocked_openai.conversation_service,
-        'openai_service': real_container_with_mocked_openai.openai_service,
-        'vacation_service': real_container_with_mocked_openai.intelligence_service
-    }
+def openai_service(real_container_with_mocked_openai):
+    return real_container_with_mocked_openai.openai_service
 
-def test_user_signup_and_conversation_flow(services):
-    user_service = services['user_service']
-    conversation_service = services['conversation_service']
+@pytest.fixture
+def vacation_service(real_container_with_mocked_openai):
+    return real_container_with_mocked_openai.intelligence_service
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_user_signup_and_conversation_flow(user_service, conversation_service):
     user_data = UserCreate(
         email="integration@example.com",
         full_name="Integration Test User",
@@ -32,23 +41,21 @@ def test_user_signup_and_conversation_flow(services):
     with patch.object(user_service, 'collection') as mock_user_collection:
         mock_user_collection.find_one = AsyncMock(return_value=None)
         mock_user_collection.insert_one = AsyncMock(return_value=Mock(inserted_id=ObjectId()))
-        user = asyncio.run(user_service.create_user(user_data))
+        user = await user_service.create_user(user_data)
         assert user is not None
         assert user.email == "integration@example.com"
     with patch.object(conversation_service, 'collection') as mock_conv_collection:
         mock_conv_collection.insert_one = AsyncMock(return_value=Mock(inserted_id=ObjectId()))
-        conversation = asyncio.run(conversation_service.create_conversation(
+        conversation = await conversation_service.create_conversation(
             user_id=str(user.id),
             title="My Vacation Plan"
-        ))
+        )
         assert conversation is not None
         assert conversation.user_id == str(user.id)
         assert conversation.title == "My Vacation Plan"
 
-@pytest.mark.asyncio
-async def test_add_message_and_openai_integration(services):
-    conversation_service = services['conversation_service']
-    openai_service = services['openai_service']
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_message_and_openai_integration(conversation_service, openai_service):
     user_id = str(ObjectId())
     
     conversation = await conversation_service.create_conversation(
@@ -64,30 +71,28 @@ async def test_add_message_and_openai_integration(services):
         result = await conversation_service.add_message(conversation_id, user_id, message)
         assert result is not None
         assert len(result.messages) >= 0
-    with patch('openai.AsyncOpenAI') as mock_openai:
-        mock_client = Mock()
-        mock_openai.return_value = mock_client
-        mock_client.chat.completions.create = Mock(
-            choices=[Mock(message=Mock(content="Great choice! Vietnam is beautiful."))]
-        )
-        ai_response = await openai_service.generate_response_async([message])
-        assert ai_response is not None
-        assert "content" in ai_response
+    # real_container_with_mocked_openai already swapped in a mock OpenAI client
+    ai_response = await openai_service.generate_response_async([message])
+    assert ai_response is not None
+    assert "content" in ai_response
 
-def test_vacation_intelligence_flow(services):
-    vacation_service = services['vacation_service']
-    conversation_id = str(ObjectId())
-    user_id = str(ObjectId())
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("phrase, destination", [
+    ("Plan a trip to Da Nang", "da nang"),
+    ("I want to visit Hanoi", "hanoi"),
+    ("Plan a trip to Kyoto", "kyoto")
+])
+async def test_vacation_intelligence_flow(vacation_service, phrase, destination):
     messages = [
-        {"role": "user", "content": "Plan a trip to Da Nang", "timestamp": datetime.utcnow().isoformat()},
-        {"role": "assistant", "content": "When do you want to go?", "timestamp": datetime.utcnow().isoformat()}
+        {"role": "user", "content": phrase, "timestamp": _TIMESTAMP},
+        {"role": "assistant", "content": "When do you want to go?", "timestamp": _TIMESTAMP}
     ]
     
-    analysis = asyncio.run(vacation_service.analyze_preferences(messages, None))
+    analysis = await vacation_service.analyze_preferences(messages, None)
     assert analysis is not None
     assert "decision_stage" in analysis
     assert "detected_interests" in analysis
     assert "mentioned_destinations" in analysis
     
     destinations = analysis.get("mentioned_destinations", [])
-    assert any("da nang" in dest.lower() for dest in destinations) 
\ No newline at end of file
+    assert any(destination in dest.lower() for dest in destinations)
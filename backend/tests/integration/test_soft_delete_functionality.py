@@ -9,7 +9,7 @@ from app.models.conversation_db import ConversationSummary
 # Import integration test fixtures
 pytest_plugins = ['tests.integration.conftest_integration']
 
-pytestmark = pytest.mark.asyncio
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 class TestSoftDeleteFunctionality:
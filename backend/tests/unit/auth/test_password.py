@@ -0,0 +1,17 @@
+from app.auth.password import get_password_hash, verify_password
+from unittest.mock import patch
+
+class TestPasswordHashing:
+    
+    def test_hash_uses_configured_rounds(self):
+        with patch("app.auth.password.get_settings") as mock_get_settings:
+            mock_get_settings.return_value.bcrypt_rounds = 5
+            hashed = get_password_hash("SecurePass123!")
+        
+        assert hashed.startswith("$2b$05$")
+    
+    def test_verify_round_trip(self):
+        hashed = get_password_hash("SecurePass123!")
+        
+        assert verify_password("SecurePass123!", hashed) is True
+        assert verify_password("WrongPass123!", hashed) is False
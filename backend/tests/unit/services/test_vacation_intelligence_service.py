@@ -7,6 +7,12 @@ import asyncio
 import pytest
 import json
 
+
+def _stream_chunks(*parts):
+    # Build an iterator shaped like a streamed chat completion.
+    return iter([MagicMock(choices=[MagicMock(delta=MagicMock(content=part))]) for part in parts])
+
+
 class TestVacationIntelligenceAdditionalCoverage:
 # Additional tests for VacationIntelligenceService coverage.
     
@@ -299,6 +305,41 @@ class TestVacationIntelligenceServiceAdditional:
         assert len(result) <= 4
         assert len(result) > 0
     
+    def test_first_unique_stops_at_limit(self):
+        from app.services.vacation_intelligence_service import _first_unique
+
+        assert _first_unique(["a", "b", "a", "c", "d", "e"], 4) == ["a", "b", "c", "d"]
+        assert _first_unique(["a", "a"], 4) == ["a"]
+
+    def test_generate_dynamic_suggestions_concern_priority(self, service):
+        conversation_state = {
+            "decision_stage": "exploring",
+            "stage_confidence": 0.8,
+            "detected_interests": [],
+            "decision_readiness": 0.5,
+            "mentioned_destinations": ["Paris"],
+            "concerns": ["weather", "budget"]
+        }
+
+        result = service.generate_dynamic_suggestions(conversation_state, "Any tips")
+
+        assert result[0] == "How can I save money?"
+
+    def test_get_smart_recommendations_concern_priority(self, service):
+        insights = {
+            "decision_stage": "finalizing",
+            "stage_confidence": 0.5,
+            "detected_interests": [],
+            "concerns": ["crowds", "language"],
+            "decision_readiness": 0.1,
+            "mentioned_destinations": []
+        }
+
+        result = service.get_smart_recommendations(None, insights, 10)
+
+        assert [r["type"] for r in result] == ["concern_addressed"]
+        assert "Communication Tips" in result[0]["content"]
+
     def test_generate_dynamic_suggestions_with_question_mark(self, service):
         conversation_state = {
             "decision_stage": "exploring",
@@ -665,7 +706,46 @@ class TestVacationIntelligenceService:
         scores = service._calculate_stage_scores(messages, None)
         
         assert scores['stage'] in ['exploring', 'comparing', 'planning', 'finalizing']
-    
+
+    def test_calculate_stage_scores_with_prelowered_messages(self, service):
+        messages = [
+            {"role": "user", "content": "Paris OR Rome?"},
+            {"role": "user", "content": "Which is BETTER in June?"}
+        ]
+        lowered = [m["content"].lower() for m in messages]
+
+        assert service._calculate_stage_scores(messages, None, lowered) == \
+            service._calculate_stage_scores(messages, None)
+
+    def test_calculate_stage_scores_budget_with_preference_word(self, service):
+        messages = [{"role": "user", "content": "My budget is small but I want local food"}]
+        scores = service._calculate_stage_scores(messages, None)
+
+        assert scores['stage'] == 'exploring'
+        assert scores['confidence'] == 1.0
+
+    def test_calculate_stage_scores_budget_with_preference_phrase(self, service):
+        messages = [{"role": "user", "content": "Budget matters, something budget-friendly"}]
+        scores = service._calculate_stage_scores(messages, None)
+
+        assert scores['stage'] == 'exploring'
+        assert scores['confidence'] == 1.0
+
+    def test_signal_bits_single_pass(self):
+        from app.services.vacation_intelligence_service import (
+            _signal_bits, _MONTH_BIT, _DURATION_BIT, _BUDGET_BIT,
+            _COMPARISON_BIT, _PREFERENCE_BIT, _TIGHT_BUDGET_BIT
+        )
+
+        bits = _signal_bits("10 days in june on a tight budget, something budget-friendly")
+        assert bits & _MONTH_BIT
+        assert bits & _DURATION_BIT
+        assert bits & _BUDGET_BIT
+        assert bits & _PREFERENCE_BIT
+        assert bits & _TIGHT_BUDGET_BIT
+        assert not bits & _COMPARISON_BIT
+        assert _signal_bits("hello there") == 0
+
     def test_detect_interests(self, service):
         text = "I love culture, food, and adventure activities"
         interests = service._detect_interests(text)
@@ -701,18 +781,25 @@ class TestVacationIntelligenceService:
         assert isinstance(destinations, list)
         # The service might extract other words, so just check it's a list
         assert isinstance(destinations, list)
-    
+
+    def test_extract_destinations_deduplicates_once(self, service):
+        messages = [
+            {"role": "user", "content": "Japan is great"},
+            {"role": "user", "content": "I really want Japan, JAPAN and Peru"}
+        ]
+        destinations = service._extract_destinations(messages)
+
+        assert [d.lower() for d in destinations].count('japan') == 1
+        assert destinations.index('Japan') < destinations.index('Peru')
+
     @pytest.mark.asyncio
     async def test_extract_destinations_with_ai(self, service):
         # Test AI-based destination extraction
         mock_openai_service = MagicMock()
         mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_message = MagicMock()
-        
-        mock_message.content = '["Bangladesh", "Vietnam"]'
-        mock_response.choices = [MagicMock(message=mock_message)]
-        mock_client.chat.completions.create = MagicMock(return_value=mock_response)
+        mock_client.chat.completions.create = MagicMock(
+            return_value=_stream_chunks('["Bangla', 'desh", "Vietnam"]')
+        )
         mock_openai_service.client = mock_client
         mock_openai_service.model = "test-model"
         
@@ -723,6 +810,21 @@ class TestVacationIntelligenceService:
         
         assert result == ["Bangladesh", "Vietnam"]
         mock_client.chat.completions.create.assert_called_once()
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_extract_destinations_with_ai_stops_when_array_closes(self, service):
+        # Chunks after the closing bracket are never read
+        chunks = _stream_chunks('```json\n["Paris",', ' "France"]', '\n```', 'trailing text')
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = MagicMock(return_value=chunks)
+        service.openai_service = MagicMock(client=mock_client, model="test-model")
+
+        messages = [{"role": "user", "content": "Paris sounds nice"}]
+        result = await service._extract_destinations_with_ai(messages)
+
+        assert result == ["Paris", "France"]
+        assert next(chunks).choices[0].delta.content == '\n```'
     
     @pytest.mark.asyncio
     async def test_extract_destinations_with_ai_no_service(self, service):
@@ -737,12 +839,9 @@ class TestVacationIntelligenceService:
         # Test AI extraction handles JSON parsing errors gracefully
         mock_openai_service = MagicMock()
         mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_message = MagicMock()
-        
-        mock_message.content = 'Invalid JSON response'
-        mock_response.choices = [MagicMock(message=mock_message)]
-        mock_client.chat.completions.create = MagicMock(return_value=mock_response)
+        mock_client.chat.completions.create = MagicMock(
+            return_value=_stream_chunks('Invalid ', 'JSON response')
+        )
         mock_openai_service.client = mock_client
         mock_openai_service.model = "test-model"
         
@@ -801,6 +900,19 @@ class TestVacationIntelligenceService:
         
         assert 'moderate' in budget_indicators
     
+    def test_extract_budget_amount_result_not_shared(self, service):
+        first = service._extract_budget_amount("around €2,500 total")
+        first["amount"] = 0
+        second = service._extract_budget_amount("around €2,500 total")
+
+        assert second == {"amount": 2500, "symbol": "€", "formatted": "€2,500"}
+
+    def test_detect_budget_level_ultra_budget_only(self, service):
+        assert service._detect_budget_level("backpacking, as cheap as possible") == ["ultra_budget"]
+
+    def test_detect_budget_level_ultra_budget_dropped_with_other_levels(self, service):
+        assert service._detect_budget_level("a hostel, but somewhere comfortable") == ["moderate"]
+
     def test_detect_budget_level_no_budget(self, service):
         budget_indicators = service._detect_budget_level("I want to travel somewhere")
         assert isinstance(budget_indicators, list)
@@ -815,7 +927,85 @@ class TestVacationIntelligenceService:
     def test_detect_concerns_no_concerns(self, service):
         concerns = service._detect_concerns("I'm excited to travel!")
         assert isinstance(concerns, list)
+
+    def test_detect_concerns_overlapping_keywords(self, service):
+        concerns = service._detect_concerns("is it unsafe for a vegan alone in the rainy season?")
+
+        assert set(concerns) == {"safety", "dietary", "solo_travel", "weather"}
+
+    def test_detect_concerns_deterministic_order(self, service):
+        concerns = service._detect_concerns("visa questions, vegan food, is it safe, the weather")
+
+        assert concerns == ["safety", "weather", "dietary", "visa"]
     
+    def test_detector_hits_shared_across_detectors(self, service):
+        from app.services.vacation_intelligence_service import _detector_hits
+
+        text = "first time abroad, staying in the cheapest hostel, is it safe?"
+        hits = _detector_hits(text)
+
+        assert ("budget", "ultra_budget") in hits
+        # "cheapest" also starts with the plain "cheap" keyword
+        assert ("budget", "budget") in hits
+        assert ("concern", "safety") in hits
+        assert ("experience", "beginner") in hits
+        assert service._detect_budget_level(text, None, hits) == ["budget"]
+        assert service._detect_concerns(text, hits) == ["safety"]
+        assert service._detect_experience_level(text, hits) == "beginner"
+
+    def test_detector_phrases_start_at_word_boundary(self, service):
+        assert service._detect_budget_level("we won some casino money") == []
+        assert service._detect_budget_level("we have no money") == ["ultra_budget"]
+        # Only the start is anchored, so longer word endings still match
+        assert service._detect_experience_level("I'm new to traveling") == "beginner"
+
+    def test_smart_recommendations_only_build_returned_content(self, service):
+        insights = {
+            "decision_stage": "exploring",
+            "stage_confidence": 0.9,
+            "detected_interests": ["beach"],
+            "mentioned_destinations": ["Bali"],
+            "concerns": ["safety"],
+            "decision_readiness": 0.9
+        }
+        recs = service.get_smart_recommendations(None, insights, 2)
+
+        assert [r["type"] for r in recs] == ["welcome", "targeted_inspiration", "destination_focus"]
+        assert "Bali" in recs[2]["content"]
+
+    def test_detector_keywords_match_at_word_start(self, service):
+        from app.services.vacation_intelligence_service import _detector_hits
+
+        assert _detector_hits("we took the train to the station") == frozenset()
+        assert _detector_hits("any savory local dishes?") == frozenset()
+        # Longer word endings still count
+        assert service._detect_concerns("rainy season, crowded streets, visas") == [
+            "weather", "crowds", "visa"
+        ]
+
+    def test_standalone_detector_hits_ignore_case(self, service):
+        from app.services.vacation_intelligence_service import _standalone_detector_hits
+
+        assert _standalone_detector_hits("Is it SAFE for a First Time traveler?") == frozenset(
+            {("concern", "safety"), ("experience", "beginner")}
+        )
+
+    @pytest.mark.parametrize("text,expected", [
+        ("is it affordable?", ["cost"]),
+        ("is it costly?", ["cost"]),
+        ("can we travel safely?", ["safety"]),
+        ("is it dangerously hot?", ["safety", "weather"]),
+    ])
+    def test_detect_concerns_matches_longer_words(self, service, text, expected):
+        assert service._detect_concerns(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("something cheaper please", ["budget"]),
+        ("a hostel full of backpackers", ["ultra_budget"]),
+    ])
+    def test_detect_budget_level_matches_longer_words(self, service, text, expected):
+        assert service._detect_budget_level(text) == expected
+
     def test_detect_experience_level(self, service):
         text = "This is my first time traveling abroad"
         level = service._detect_experience_level(text)
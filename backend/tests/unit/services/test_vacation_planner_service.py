@@ -59,6 +59,14 @@ class TestVacationPlannerInit:
         assert "travel" in suggestions_text
         assert "activities" in suggestions_text
     
+    def test_default_suggestions_cannot_be_corrupted(self):
+        planner = VacationPlanner()
+        planner.default_suggestions.append("Changed")
+        planner.generate_suggestions(None).clear()
+        
+        assert len(planner.default_suggestions) == 4
+        assert len(VacationPlanner().generate_suggestions(None)) == 4
+    
     def test_initialization_plans_created(self):
         planner = VacationPlanner()
         
@@ -108,6 +116,28 @@ class TestVacationPlannerAdditionalCoverage:
         assert result is not None
         assert result["destination"] == "12345"
     
+    def test_destination_normalized_the_same_everywhere(self, vacation_planner):
+        preferences = {"destinations": ["  Kyoto  ", "Osaka"]}
+        plan = vacation_planner.create_vacation_plan(preferences)
+        suggestions = vacation_planner.generate_suggestions(preferences)
+        recommendations = vacation_planner._generate_recommendations(preferences)
+        
+        assert plan["destination"] == "Kyoto"
+        assert suggestions[0] == "Tell me more about your plans for Kyoto."
+        assert "trip to Kyoto," in recommendations[0]
+    
+    def test_create_vacation_plan_and_summary_reuse_timestamp(self, vacation_planner):
+        preferences = {"destinations": ["Paris"]}
+        stamp = "2024-01-01T12:00:00"
+        
+        assert vacation_planner.create_vacation_plan(preferences, now_iso=stamp)["created_at"] == stamp
+        assert vacation_planner.create_vacation_summary(preferences, now_iso=stamp)["created_at"] == stamp
+        assert vacation_planner.create_vacation_plan(preferences)["created_at"] != stamp
+    
+    def test_create_vacation_plan_and_summary_reject_non_dict(self, vacation_planner):
+        assert vacation_planner.create_vacation_plan(["Paris"]) is None
+        assert vacation_planner.create_vacation_summary("Paris") is None
+    
     def test_create_vacation_plan_end_date_before_start_date(self, vacation_planner):
         preferences = {
             "destinations": ["Paris"],
@@ -287,6 +317,19 @@ class TestVacationPlannerCoverage:
         recs = planner._generate_recommendations(prefs_foodie)
         assert len(recs) > 0
     
+    def test_generate_recommendations_style_with_non_string_item(self, planner):
+        # Only the interests template joins the styles, so a matched style
+        # never needs every item to be a string
+        preferences = {
+            "destinations": ["Paris"],
+            "budget_range": "moderate",
+            "travel_style": ["adventure", 5]
+        }
+        recs = planner._generate_recommendations(preferences)
+        
+        assert recs[1] == "Since you love adventure, plan hikes and outdoor activities in Paris."
+        assert planner.create_vacation_summary(preferences) is not None
+    
     def test_create_vacation_plan_with_itinerary(self, planner):
         preferences = {
             "destinations": ["Paris"],
@@ -436,6 +479,19 @@ class TestVacationPlannerDateHandling:
         assert plan is not None
         assert plan['duration_days'] == 7
     
+    def test_duration_calculation_malformed_travel_dates(self, planner):
+        for travel_dates in ("2024-06-01", {"start": 20240601, "end": "2024-06-05"}, ["2024-06-01"]):
+            plan = planner.create_vacation_plan({"destinations": ["Paris"], "travel_dates": travel_dates})
+            assert plan["duration_days"] == 7
+    
+    def test_duration_calculation_uses_calendar_dates(self, planner):
+        preferences = {
+            "destinations": ["Paris"],
+            "travel_dates": {"start": "2024-06-01T22:00:00", "end": "2024-06-03T08:00:00"}
+        }
+        plan = planner.create_vacation_plan(preferences)
+        assert plan["duration_days"] == 3
+    
     def test_duration_calculation_single_day(self, planner):
         preferences = {
             "destinations": ["Paris"],
@@ -523,17 +579,27 @@ class TestVacationPlannerExceptionHandling:
         return VacationPlanner()
     
     def test_create_vacation_summary_exception_handling(self, planner):
-        # Create preferences that might cause exception during processing
+        # Preferences that blow up while the summary checks for missing details
+        class BrokenPreferences(dict):
+            def get(self, key, default=None):
+                if key == "travel_style":
+                    raise Exception("Test error")
+                return super().get(key, default)
+        
+        preferences = BrokenPreferences(destinations=["Paris"], budget_range="moderate")
+        summary = planner.create_vacation_summary(preferences)
+        # Should handle exception and return None
+        assert summary is None
+    
+    def test_create_vacation_summary_completeness_matches_helper(self, planner):
         preferences = {
             "destinations": ["Paris"],
-            "budget_range": "moderate"
+            "budget_range": "moderate",
+            "group_size": 2
         }
-        
-        # Mock an exception in _calculate_completeness_percentage
-        with patch.object(planner, '_calculate_completeness_percentage', side_effect=Exception("Test error")):
-            summary = planner.create_vacation_summary(preferences)
-            # Should handle exception and return None
-            assert summary is None
+        summary = planner.create_vacation_summary(preferences)
+        assert summary["completeness_percentage"] == planner._calculate_completeness_percentage(preferences)
+        assert summary["missing_info"] == ["Travel dates", "Travel style"]
     
     def test_create_vacation_summary_exception_in_recommendations(self, planner):
         preferences = {
@@ -578,12 +644,26 @@ class TestVacationPlannerMissingCoverage:
             "travel_dates": {"start": "2023-06-01", "end": "2023-06-05"}
         }
         
-        # Mock an exception in one of the helper methods
-        with patch.object(planner, '_generate_destination_activities', side_effect=Exception("Test error")):
+        # Mock an exception while building the plan sections
+        with patch.object(planner, '_build_plan_sections', side_effect=Exception("Test error")):
             plan = planner.create_vacation_plan(preferences)
             # Should handle exception and return None
             assert plan is None
     
+    def test_plan_sections_match_individual_helpers(self, planner):
+        preferences = {"budget_range": "luxury"}
+        sections = planner._build_plan_sections("Tokyo", preferences)
+        
+        assert sections["estimated_budget"] == planner._generate_budget_estimate(preferences)
+        assert sections["suggested_activities"] == planner._generate_destination_activities("Tokyo", preferences)
+        assert sections["accommodation_recommendations"] == planner._generate_accommodation_recommendations(
+            "Tokyo", preferences
+        )
+        assert sections["transportation_options"] == planner._generate_transportation_options("Tokyo", preferences)
+        assert sections["best_time_to_visit"] == planner._generate_best_time_to_visit("Tokyo", preferences)
+        assert sections["weather_info"] == planner._generate_weather_info("Tokyo", preferences)
+        assert sections["local_tips"] == planner._generate_local_tips("Tokyo", preferences)
+    
     def test_generate_destination_activities_paris(self, planner):
         activities = planner._generate_destination_activities("Paris", {})
         assert len(activities) > 0
@@ -599,6 +679,11 @@ class TestVacationPlannerMissingCoverage:
         assert len(activities) > 0
         assert any("Temple" in act or "Beach" in act for act in activities)
     
+    def test_generate_destination_activities_city_in_longer_name(self, planner):
+        activities = planner._generate_destination_activities("Paris, France", {})
+        assert activities[0] == "Visit the Eiffel Tower in Paris, France"
+        assert len(activities) == 5
+    
     def test_generate_destination_activities_other(self, planner):
         activities = planner._generate_destination_activities("London", {})
         assert len(activities) > 0
@@ -633,6 +718,15 @@ class TestVacationPlannerMissingCoverage:
         assert all(isinstance(tip, str) for tip in tips)
         assert all("Paris" in tip for tip in tips)
     
+    def test_generated_details_are_fresh_per_call(self, planner):
+        tips = planner._generate_local_tips("Lisbon", {})
+        tips.append("extra")
+        options = planner._generate_transportation_options("Lisbon", {})
+        options[0]["type"] = "Changed"
+        
+        assert "extra" not in planner._generate_local_tips("Lisbon", {})
+        assert planner._generate_transportation_options("Lisbon", {})[0]["type"] == "Public Transit"
+    
     def test_generate_weather_info(self, planner):
         weather = planner._generate_weather_info("Paris", {})
         assert isinstance(weather, dict)
@@ -663,6 +757,11 @@ class TestVacationPlannerMissingCoverage:
         assert budget["min"] == 150
         assert budget["max"] == 300
     
+    def test_generate_budget_estimate_returns_a_copy(self, planner):
+        estimate = planner._generate_budget_estimate({"budget_range": "luxury"})
+        estimate["min"] = 0
+        assert planner._generate_budget_estimate({"budget_range": "luxury"})["min"] == 300
+    
     def test_generate_budget_estimate_default(self, planner):
         preferences = {}
         budget = planner._generate_budget_estimate(preferences)
@@ -735,6 +834,19 @@ class TestVacationPlannerMissingCoverage:
         assert all(isinstance(rec, str) for rec in recs)
         assert all(len(rec) > 10 for rec in recs)
     
+    def test_generate_recommendations_style_priority_ignores_order(self, planner):
+        preferences = {
+            "destinations": ["Lima"],
+            "travel_style": ["Foodie", "relaxation", "adventure"]
+        }
+        recs = planner._generate_recommendations(preferences)
+        assert recs[1] == "Since you love adventure, plan hikes and outdoor activities in Lima."
+    
+    def test_generate_recommendations_text_group_size(self, planner):
+        preferences = {"destinations": ["Lima"], "group_size": "2"}
+        recs = planner._generate_recommendations(preferences)
+        assert len(recs) == 3
+    
     def test_generate_recommendations_with_travel_dates(self, planner):
         preferences = {
             "destinations": ["Paris"],
@@ -877,6 +989,15 @@ class TestVacationPlanner:
         # Should have some suggestions even with complete preferences
         assert len(suggestions) <= 3
     
+    def test_generate_suggestions_asks_in_order(self, planner):
+        preferences = {"destinations": ["Rome"], "budget_range": "moderate"}
+        suggestions = planner.generate_suggestions(preferences)
+        assert suggestions == [
+            "Tell me more about your plans for Rome.",
+            "When do you want to travel?",
+            "What kind of activities do you enjoy?"
+        ]
+    
     def test_generate_suggestions_max_limit(self, planner):
         preferences = {
             "destinations": ["Paris"],